@@ -1,94 +1,138 @@
 from __future__ import annotations
-import json, os, re, time, uuid
+import asyncio, functools, logging, os, secrets, threading, time
+from contextlib import AsyncExitStack
 from datetime import datetime, timezone
 from typing import Any, Literal
 
+import orjson
+
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
-from langgraph.graph import END, StateGraph
 from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, StateGraph
 
+from app.agent import llm_cache
 from app.agent.state import AgentState
 from app.agent.prompts import ANALYZER_SYSTEM_PROMPT, INVESTIGATOR_SYSTEM_PROMPT, MITIGATOR_SYSTEM_PROMPT
-from app.tools.threat_intel import bulk_investigate
-from app.tools.sys_actions import execute_action, send_alert
+from app.agent.schemas import AnalyzerOutput, InvestigatorOutput, MitigatorOutput
+from app.tools.threat_intel import investigate_batched
+from app.tools.sys_actions import disable_users_async, execute_action, send_alert
 
+log = logging.getLogger("guardian.agent")
 
-def _now(): return datetime.now(timezone.utc).isoformat()
 
+def _wall_now(): return datetime.now(timezone.utc).isoformat()
 
-def _build_llm():
+
+# Event timestamps only need ~100 ms resolution, so read a string a clock thread keeps fresh
+_NOW_STR = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+
+def _tick_clock():
+    global _NOW_STR
+    while True:
+        time.sleep(0.1)
+        _NOW_STR = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+
+threading.Thread(target=_tick_clock, name="guardian-clock", daemon=True).start()
+
+
+def _now(): return _NOW_STR
+
+
+_llm_lock = threading.Lock()
+
+
+def _llm_config():
+    """Pick (provider, model) from whichever API key is configured."""
     if os.getenv("ANTHROPIC_API_KEY"):
-        from langchain_anthropic import ChatAnthropic
-        return ChatAnthropic(model="claude-sonnet-4-20250514", max_tokens=2048, temperature=0)
+        return "anthropic", "claude-sonnet-4-20250514"
     elif os.getenv("GROQ_API_KEY"):
-        from langchain_groq import ChatGroq
-        return ChatGroq(model=os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile"), max_tokens=2048, temperature=0)
+        return "groq", os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
     elif os.getenv("OPENAI_API_KEY"):
-        from langchain_openai import ChatOpenAI
-        return ChatOpenAI(model="gpt-4o", max_tokens=2048, temperature=0)
+        return "openai", "gpt-4o"
     raise EnvironmentError("No LLM API key found. Set GROQ_API_KEY, ANTHROPIC_API_KEY, or OPENAI_API_KEY.")
 
 
-def _parse(text):
-    text = re.sub(r"```(?:json)?\s*", "", text).strip()
-    m = re.search(r"\{.*\}", text, re.DOTALL)
-    if m:
-        try: return json.loads(m.group())
-        except: pass
-    return {}
+@functools.lru_cache(maxsize=4)
+def _build_llm_cached(provider, model):
+    if provider == "anthropic":
+        from langchain_anthropic import ChatAnthropic
+        # Nodes only consume the final content, so skip SSE streaming/parsing entirely
+        return ChatAnthropic(model=model, max_tokens=2048, temperature=0, streaming=False)
+    elif provider == "groq":
+        from langchain_groq import ChatGroq
+        return ChatGroq(model=model, max_tokens=2048, temperature=0, streaming=False)
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(model=model, max_tokens=2048, temperature=0, streaming=False)
+
+
+def _build_llm():
+    """Return the process-wide LLM client — built once per provider+model, not per node call."""
+    provider, model = _llm_config()
+    with _llm_lock:
+        return _build_llm_cached(provider, model)
+
+
+def _system_message(prompt):
+    """Mark the static system prompt cacheable on Anthropic; OpenAI caches prefixes automatically, Groq has no cache."""
+    if _llm_config()[0] == "anthropic":
+        return SystemMessage(content=[{"type": "text", "text": prompt, "cache_control": {"type": "ephemeral"}}])
+    return SystemMessage(content=prompt)
+
+
+async def _invoke_structured(llm, schema, system, user):
+    """Call the LLM for a validated `schema` instance, answering repeated prompts from the response cache."""
+    key = llm_cache.cache_key(system, user, f"{':'.join(_llm_config())}:{schema.__name__}")
+    cached = llm_cache.get(key)
+    if cached is not None:
+        return schema.model_validate_json(cached)
+    structured = llm.with_structured_output(schema)
+    messages = [_system_message(system), HumanMessage(content=user)]
+    result = None
+    for _ in range(2):  # one retry on invalid output; clients already run at temperature=0
+        try:
+            result = await structured.ainvoke(messages)
+        except ValueError as e:  # pydantic ValidationError / OutputParserException
+            log.warning("%s validation failed: %s", schema.__name__, e)
+            continue
+        if result is not None:
+            break
+    if result is None:
+        raise ValueError(f"LLM did not return a valid {schema.__name__}")
+    llm_cache.put(key, result.model_dump_json())
+    return result
 
 
 def _emit(state, event_type, data):
     return [{"type": event_type, "timestamp": _now(), "incident_id": state.get("incident_id", ""), **data}]
 
 
-def _persist(state):
+def _persist(state, update):
+    """Write just the columns this node changed — the row itself is created by the API."""
     try:
-        from app.memory.store import save_incident
-        save_incident(dict(state))
+        from app.memory.store import save_incident_delta
+        save_incident_delta(state.get("incident_id", ""), update)
     except Exception as e:
-        print(f"  ⚠️  Persist error: {e}")
-
-
-def _base(state):
-    """Echo all identity fields so LangGraph keeps them across every node."""
-    return {
-        "incident_id":      state.get("incident_id", ""),
-        "log_source":       state.get("log_source", "unknown"),
-        "raw_log":          state.get("raw_log", ""),
-        "started_at":       state.get("started_at", _now()),
-        "completed_at":     state.get("completed_at", ""),
-        "approval_token":   state.get("approval_token", ""),
-        "approval_decision":state.get("approval_decision", "pending"),
-        "mitigation_plan":  state.get("mitigation_plan", ""),
-        "executed_actions": state.get("executed_actions", []),
-        "investigation_results": state.get("investigation_results", []),
-        "found_indicators": state.get("found_indicators", []),
-        "risk_score":       state.get("risk_score", 0),
-        "requires_approval":state.get("requires_approval", False),
-    }
+        log.warning("persist error: %s", e)
 
 
 # ---------------------------------------------------------------------------
 # Nodes
 # ---------------------------------------------------------------------------
 
-def analyzer_node(state):
+async def analyzer_node(state):
     iid = state.get("incident_id", "?")
-    print(f"\n🔍 [ANALYZER] incident={iid[:8]}")
+    log.info("analyzer incident=%s", iid[:8])
     llm = _build_llm()
-    response = llm.invoke([
-        SystemMessage(content=ANALYZER_SYSTEM_PROMPT),
-        HumanMessage(content=f"Analyze this security log:\n\n{state['raw_log']}"),
-    ])
-    parsed = _parse(response.content)
-    risk_score = int(parsed.get("risk_score", 0))
-    found_indicators = parsed.get("found_indicators", [])
-    threat_summary = parsed.get("threat_summary", "No summary provided.")
-    print(f"  📊 Risk Score: {risk_score}/10  |  Indicators: {found_indicators}")
+    result = await _invoke_structured(llm, AnalyzerOutput, ANALYZER_SYSTEM_PROMPT,
+        f"Analyze this security log:\n\n{state['raw_log']}")
+    risk_score = result.risk_score
+    found_indicators = result.found_indicators
+    threat_summary = result.threat_summary
+    log.info("analyzer incident=%s risk=%s indicators=%s", iid[:8], risk_score, found_indicators)
 
     update = {
-        **_base(state),
         "messages": [AIMessage(content=f"**Analysis** (Risk: {risk_score}/10)\n\n{threat_summary}")],
         "risk_score": risk_score,
         "found_indicators": found_indicators,
@@ -100,36 +144,34 @@ def analyzer_node(state):
             "threat_summary": threat_summary,
         }),
     }
-    _persist({**state, **update})
+    _persist(state, update)
     return update
 
 
-def investigator_node(state):
+async def investigator_node(state):
     iid = state.get("incident_id", "?")
-    print(f"\n🕵️  [INVESTIGATOR] incident={iid[:8]}")
-    llm = _build_llm()
+    log.info("investigator incident=%s", iid[:8])
     indicators = state.get("found_indicators", [])
-    ti_results = bulk_investigate(indicators) if indicators else []
+    # Start the TI lookups first so they overlap with LLM client setup
+    ti_task = asyncio.create_task(investigate_batched(indicators)) if indicators else None
+    llm = _build_llm()
+    ti_results = await ti_task if ti_task else []
 
     for r in ti_results:
-        print(f"  {'🔴 MALICIOUS' if r.get('is_malicious') else '🟢 Clean'} | {r.get('indicator','?')}")
+        log.info("ti incident=%s indicator=%s malicious=%s", iid[:8], r.get("indicator", "?"), bool(r.get("is_malicious")))
 
     if indicators and ti_results:
-        response = llm.invoke([
-            SystemMessage(content=INVESTIGATOR_SYSTEM_PROMPT),
-            HumanMessage(content=f"Original risk: {state['risk_score']}/10\nIndicators: {indicators}\nTI:\n{json.dumps(ti_results, indent=2)}"),
-        ])
-        parsed = _parse(response.content)
-        updated_score = int(parsed.get("updated_risk_score", state["risk_score"]))
-        threat_context = parsed.get("threat_context", "")
-        confidence = parsed.get("confidence", "MEDIUM")
+        result = await _invoke_structured(llm, InvestigatorOutput, INVESTIGATOR_SYSTEM_PROMPT,
+            f"Original risk: {state['risk_score']}/10\nIndicators: {indicators}\nTI:\n{orjson.dumps(ti_results, option=orjson.OPT_INDENT_2).decode()}")
+        updated_score = result.updated_risk_score
+        threat_context = result.threat_context
+        confidence = result.confidence
     else:
         updated_score = state["risk_score"]
         threat_context = "No indicators to investigate."
         confidence = "LOW"
 
     update = {
-        **_base(state),
         "messages": [AIMessage(content=f"**TI Complete** Risk: {updated_score}/10 ({confidence})\n\n{threat_context}")],
         "risk_score": updated_score,
         "investigation_results": ti_results,
@@ -140,31 +182,27 @@ def investigator_node(state):
             "ti_results": ti_results,
         }),
     }
-    _persist({**state, **update})
+    _persist(state, update)
     return update
 
 
-def mitigator_node(state):
+async def mitigator_node(state):
     iid = state.get("incident_id", "?")
-    print(f"\n🛡️  [MITIGATOR] incident={iid[:8]}")
+    log.info("mitigator incident=%s", iid[:8])
     llm = _build_llm()
-    response = llm.invoke([
-        SystemMessage(content=MITIGATOR_SYSTEM_PROMPT),
-        HumanMessage(content=f"Risk: {state['risk_score']}/10\nIndicators: {state['found_indicators']}\nTI: {json.dumps(state.get('investigation_results',[]))}\nLog:\n{state['raw_log']}"),
-    ])
-    parsed = _parse(response.content)
-    mitigation_plan = parsed.get("mitigation_plan", "No plan generated.")
-    actions = parsed.get("actions", [])
+    result = await _invoke_structured(llm, MitigatorOutput, MITIGATOR_SYSTEM_PROMPT,
+        f"Risk: {state['risk_score']}/10\nIndicators: {state['found_indicators']}\nTI: {orjson.dumps(state.get('investigation_results',[])).decode()}\nLog:\n{state['raw_log']}")
+    mitigation_plan = result.mitigation_plan
+    actions = [a.model_dump() for a in result.actions]
     requires_approval = state["risk_score"] > 7
-    approval_token = str(uuid.uuid4()) if requires_approval else ""
-    full_plan = f"{mitigation_plan}\n\n__ACTIONS__\n{json.dumps(actions)}"
+    approval_token = secrets.token_hex(16) if requires_approval else ""
     status = "awaiting_approval" if requires_approval else "executing"
-    print(f"  🔐 Requires approval: {requires_approval}  |  Actions: {len(actions)}")
+    log.info("mitigator incident=%s requires_approval=%s actions=%d", iid[:8], requires_approval, len(actions))
 
     update = {
-        **_base(state),
         "messages": [AIMessage(content=f"**Mitigation Plan**\n\n{mitigation_plan}")],
-        "mitigation_plan": full_plan,
+        "mitigation_plan": mitigation_plan,
+        "actions": actions,
         "requires_approval": requires_approval,
         "approval_token": approval_token,
         "approval_decision": "pending" if requires_approval else "auto_approved",
@@ -177,37 +215,43 @@ def mitigator_node(state):
             "approval_token": approval_token,
         }),
     }
-    _persist({**state, **update})
+    _persist(state, update)
     return update
 
 
-def _poll_for_web_approval(incident_id, timeout=3600):
-    from app.memory.store import get_incident
-    deadline = time.time() + timeout
-    while time.time() < deadline:
-        inc = get_incident(incident_id)
-        if inc:
-            decision = inc.get("approval_decision", "pending")
-            if decision == "approved": return True
-            if decision == "denied": return False
-        time.sleep(2)
-    print("  ⏰ Approval timeout — defaulting to DENIED")
-    return False
+_approval_events: dict[str, asyncio.Event] = {}
+_approval_results: dict[str, bool] = {}
+
+
+def signal_approval(incident_id, approved):
+    """Wake the approval node waiting on this incident (called by the approve/deny endpoints)."""
+    _approval_results[incident_id] = approved
+    _approval_events.setdefault(incident_id, asyncio.Event()).set()
 
 
-def human_approval_node(state):
+async def _wait_for_web_approval(incident_id, timeout=3600):
+    ev = _approval_events.setdefault(incident_id, asyncio.Event())
+    try:
+        await asyncio.wait_for(ev.wait(), timeout)
+    except asyncio.TimeoutError:
+        log.warning("approval timeout incident=%s — defaulting to DENIED", incident_id[:8])
+    finally:
+        _approval_events.pop(incident_id, None)
+    return _approval_results.pop(incident_id, False)
+
+
+async def human_approval_node(state):
     iid = state.get("incident_id", "?")
-    print(f"\n⚠️  [HITL] Waiting for approval — incident={iid[:8]}")
+    log.info("hitl waiting for approval incident=%s", iid[:8])
 
     if os.getenv("GUARDIAN_AUTO_APPROVE", "").lower() in ("true", "1", "yes"):
         approved = True
-        print("  ✅ AUTO-APPROVED")
+        log.info("hitl incident=%s auto-approved", iid[:8])
     elif os.getenv("GUARDIAN_MODE", "cli") == "web":
-        approved = _poll_for_web_approval(iid)
+        approved = await _wait_for_web_approval(iid)
     else:
-        plan_text = state.get("mitigation_plan", "")
-        display_plan = plan_text.split("__ACTIONS__\n")[0] if "__ACTIONS__" in plan_text else plan_text
-        actions = json.loads(plan_text.split("__ACTIONS__\n")[1]) if "__ACTIONS__" in plan_text else []
+        display_plan = state.get("mitigation_plan", "")
+        actions = state.get("actions", [])
         print("=" * 60)
         print(f"Risk: {state['risk_score']}/10 | Indicators: {state['found_indicators']}")
         print(f"\nPlan:\n{display_plan}")
@@ -221,86 +265,99 @@ def human_approval_node(state):
             elif ans in ("abort", "a"): raise SystemExit("Aborted.")
 
     update = {
-        **_base(state),
         "messages": [HumanMessage(content="APPROVED" if approved else "DENIED")],
         "requires_approval": not approved,
         "approval_decision": "approved" if approved else "denied",
         "current_node": "human_approval",
         "stream_events": _emit(state, "approval_decision", {"approved": approved}),
     }
-    _persist({**state, **update})
+    _persist(state, update)
     return update
 
 
-def executor_node(state):
+def _action_call(atype, target, just):
+    """Map a planned action onto the blocking tool call that carries it out."""
+    if atype == "block_ip":       return functools.partial(execute_action, "block_ip", ip_address=target, reason=just)
+    if atype == "block_hash":     return functools.partial(execute_action, "block_hash", file_hash=target, threat_name=just)
+    if atype == "isolate_host":   return functools.partial(execute_action, "isolate_host", hostname=target, reason=just)
+    return functools.partial(send_alert.invoke, {"severity": "HIGH", "title": f"Guardian: {atype}", "description": just, "indicators": [target]})
+
+
+async def executor_node(state):
     iid = state.get("incident_id", "?")
-    print(f"\n⚡ [EXECUTOR] incident={iid[:8]}")
+    log.info("executor incident=%s", iid[:8])
     plan_text = state.get("mitigation_plan", "")
-    actions = json.loads(plan_text.split("__ACTIONS__\n")[1]) if "__ACTIONS__" in plan_text else []
+    actions = state.get("actions", [])
 
     if state.get("requires_approval", False):
-        send_alert.invoke({"severity": "HIGH", "title": "Threat — manual review required",
+        await asyncio.to_thread(send_alert.invoke, {"severity": "HIGH", "title": "Threat — manual review required",
                            "description": plan_text[:500], "indicators": state.get("found_indicators", [])})
         update = {
-            **_base(state),
             "messages": [AIMessage(content="Actions blocked by operator.")],
             "executed_actions": ["alert_only (denied)"],
-            "current_node": "executor", "status": "complete", "completed_at": _now(),
+            "current_node": "executor", "status": "complete", "completed_at": _wall_now(),
             "stream_events": _emit(state, "executor_complete", {"executed_actions": ["alert_only (denied)"]}),
         }
-        _persist({**state, **update})
+        _persist(state, update)
         return update
 
+    # Actions target independent systems, so run them concurrently and keep plan order in the results
+    planned = [(a.get("action_type", ""), a.get("target", ""), a.get("justification", "")) for a in actions]
+    planned = [p for p in planned if p[0] and p[1]]
+    for atype, target, _ in planned:
+        log.info("executor incident=%s action=%s target=%s", iid[:8], atype, target)
+    # User disables go out as one batch (one IdP connection, users in parallel); the rest on threads
+    users = [(target, just) for atype, target, just in planned if atype == "disable_user"]
+    jobs = [asyncio.to_thread(_action_call(*p)) for p in planned if p[0] != "disable_user"]
+    if users:
+        jobs.append(disable_users_async(users))
+    outcomes = await asyncio.gather(*jobs, return_exceptions=True)
+    batch = outcomes.pop() if users else []
+    if isinstance(batch, Exception):
+        batch = [batch] * len(users)
+    other_it, user_it = iter(outcomes), iter(batch)
+    results = [next(user_it) if p[0] == "disable_user" else next(other_it) for p in planned]
     executed = []
-    for action in actions:
-        atype = action.get("action_type", "")
-        target = action.get("target", "")
-        just = action.get("justification", "")
-        if not atype or not target: continue
-        print(f"  ▶️  {atype} → {target}")
-        if atype == "block_ip":        result = execute_action("block_ip", ip_address=target, reason=just)
-        elif atype == "block_hash":    result = execute_action("block_hash", file_hash=target, threat_name=just)
-        elif atype == "disable_user":  result = execute_action("disable_user", username=target, reason=just)
-        elif atype == "isolate_host":  result = execute_action("isolate_host", hostname=target, reason=just)
-        else:                          result = send_alert.invoke({"severity": "HIGH", "title": f"Guardian: {atype}", "description": just, "indicators": [target]})
+    for (atype, target, _), result in zip(planned, results):
+        if isinstance(result, Exception):
+            log.warning("executor incident=%s action=%s target=%s failed: %s", iid[:8], atype, target, result)
+            result = {"status": "error"}
         executed.append(f"{atype}:{target} → {result.get('status','?')}")
 
-    send_alert.invoke({"severity": "HIGH" if state["risk_score"] >= 7 else "MEDIUM",
+    await asyncio.to_thread(send_alert.invoke, {"severity": "HIGH" if state["risk_score"] >= 7 else "MEDIUM",
                        "title": f"Incident Complete (Risk: {state['risk_score']}/10)",
                        "description": f"Executed {len(executed)} actions.",
                        "indicators": state.get("found_indicators", [])})
 
     update = {
-        **_base(state),
         "messages": [AIMessage(content=f"Executed: {executed}")],
         "executed_actions": executed,
-        "current_node": "executor", "status": "complete", "completed_at": _now(),
+        "current_node": "executor", "status": "complete", "completed_at": _wall_now(),
         "stream_events": _emit(state, "executor_complete", {"executed_actions": executed}),
     }
-    _persist({**state, **update})
+    _persist(state, update)
     return update
 
 
 def report_node(state):
     iid = state.get("incident_id", "?")
-    plan_text = state.get("mitigation_plan", "")
-    display_plan = plan_text.split("__ACTIONS__\n")[0] if "__ACTIONS__" in plan_text else plan_text
-    report = (f"\n{'='*70}\n  GUARDIAN — INCIDENT {iid}\n{'='*70}\n"
-              f"  Risk   : {state.get('risk_score',0)}/10\n"
-              f"  IOCs   : {state.get('found_indicators',[])}\n"
-              f"\n--- PLAN ---\n{display_plan}\n\n--- ACTIONS ---\n")
-    for a in state.get("executed_actions", []):
-        report += f"  ✓ {a}\n"
-    report += f"{'='*70}"
-    print(report)
+    display_plan = state.get("mitigation_plan", "")
+    rule = "=" * 70
+    parts = ["", rule, f"  GUARDIAN — INCIDENT {iid}", rule,
+             f"  Risk   : {state.get('risk_score',0)}/10",
+             f"  IOCs   : {state.get('found_indicators',[])}",
+             "", "--- PLAN ---", display_plan, "", "--- ACTIONS ---"]
+    parts.extend(f"  ✓ {a}" for a in state.get("executed_actions", []))
+    parts.append(rule)
+    report = "\n".join(parts)
+    log.info("%s", report)
 
     update = {
-        **_base(state),
         "messages": [AIMessage(content=report)],
-        "current_node": "report", "status": "complete", "completed_at": _now(),
+        "current_node": "report", "status": "complete", "completed_at": _wall_now(),
         "stream_events": _emit(state, "incident_complete", {"report": report}),
     }
-    _persist({**state, **update})
+    _persist(state, update)
     return update
 
 
@@ -308,6 +365,10 @@ def report_node(state):
 # Routing
 # ---------------------------------------------------------------------------
 
+def route_after_analyzer(state) -> Literal["investigator", "report"]:
+    """Noise-tier incidents (risk <= 3) skip investigation/mitigation and go straight to the report."""
+    return "report" if state.get("risk_score", 0) <= 3 else "investigator"
+
 def route_after_mitigator(state) -> Literal["human_approval", "executor"]:
     return "human_approval" if state.get("requires_approval") else "executor"
 
@@ -328,7 +389,8 @@ def build_graph(checkpointer=None):
     builder.add_node("executor", executor_node)
     builder.add_node("report", report_node)
     builder.set_entry_point("analyzer")
-    builder.add_edge("analyzer", "investigator")
+    builder.add_conditional_edges("analyzer", route_after_analyzer,
+        {"investigator": "investigator", "report": "report"})
     builder.add_edge("investigator", "mitigator")
     builder.add_conditional_edges("mitigator", route_after_mitigator,
         {"human_approval": "human_approval", "executor": "executor"})
@@ -336,4 +398,55 @@ def build_graph(checkpointer=None):
         {"executor": "executor"})
     builder.add_edge("executor", "report")
     builder.add_edge("report", END)
-    return builder.compile(checkpointer=checkpointer or MemorySaver())
\ No newline at end of file
+    return builder.compile(checkpointer=checkpointer or MemorySaver())
+
+
+# Process-wide graph over SQLite checkpoints, opened/closed by the API's startup/shutdown hooks
+_checkpointer_stack: AsyncExitStack | None = None
+_checkpointer = None
+_compiled_graph = None
+
+
+async def open_graph():
+    """Open the SQLite checkpointer and compile the shared graph; runs are isolated by thread_id."""
+    global _checkpointer_stack, _checkpointer, _compiled_graph
+    if _compiled_graph is not None:
+        return _compiled_graph
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+    from app.memory.store import DB_PATH
+    stack = AsyncExitStack()
+    _checkpointer = await stack.enter_async_context(
+        AsyncSqliteSaver.from_conn_string(str(DB_PATH.with_name("guardian_checkpoints.db")))
+    )
+    _checkpointer_stack = stack
+    _compiled_graph = build_graph(checkpointer=_checkpointer)
+    return _compiled_graph
+
+
+async def close_graph():
+    """Close the checkpoint connection — aiosqlite's non-daemon worker thread would otherwise block exit."""
+    global _checkpointer_stack, _checkpointer, _compiled_graph
+    stack, _checkpointer_stack = _checkpointer_stack, None
+    _checkpointer = _compiled_graph = None
+    if stack is not None:
+        await stack.aclose()
+
+
+def get_compiled_graph():
+    if _compiled_graph is None:
+        raise RuntimeError("Graph is not open — await open_graph() on startup")
+    return _compiled_graph
+
+
+async def forget_incident(incident_id):
+    """Drop a finished incident's checkpoints so guardian_checkpoints.db doesn't grow per incident."""
+    saver = _checkpointer
+    if saver is None:
+        return
+    try:
+        await saver.adelete_thread(incident_id)
+    except NotImplementedError:  # langgraph-checkpoint-sqlite 2.0.x has no delete_thread yet
+        async with saver.lock:
+            await saver.conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (incident_id,))
+            await saver.conn.execute("DELETE FROM writes WHERE thread_id = ?", (incident_id,))
+            await saver.conn.commit()
@@ -0,0 +1,56 @@
+"""
+LLM response cache — content-addressed SQLite store for node completions.
+
+Keys are SHA-256 digests of (system prompt, user prompt, model), so a replayed
+or duplicate log (scheduler rescans, client retries) is answered from disk
+instead of paying another LLM round-trip.
+
+Provides:
+  - cache_key() : Hash a prompt pair + model id into a cache key
+  - get()       : Cached completion text, or None
+  - put()       : Store a completion
+"""
+
+from __future__ import annotations
+import hashlib
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+DB_PATH = Path(os.getenv("GUARDIAN_STATE_DIR", "/tmp")) / "guardian_llm_cache.db"
+
+# On Railway, use /data volume if available (persistent storage)
+if Path("/data").exists():
+    DB_PATH = Path("/data/guardian_llm_cache.db")
+
+_conn: sqlite3.Connection | None = None
+_lock = threading.Lock()
+
+
+def _connect() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(str(DB_PATH), check_same_thread=False)
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID"
+        )
+        _conn.commit()
+    return _conn
+
+
+def cache_key(system: str, user: str, model_id: str) -> str:
+    return hashlib.sha256("\0".join((system, user, model_id)).encode()).hexdigest()
+
+
+def get(key: str) -> str | None:
+    with _lock:
+        row = _connect().execute("SELECT value FROM llm_cache WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def put(key: str, value: str) -> None:
+    with _lock:
+        conn = _connect()
+        conn.execute("INSERT OR REPLACE INTO llm_cache (key, value) VALUES (?, ?)", (key, value))
+        conn.commit()
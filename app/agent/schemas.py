@@ -0,0 +1,39 @@
+"""
+Structured-output schemas for the LLM-powered nodes.
+
+Each model mirrors the JSON schema spelled out in the matching system prompt
+(see prompts.py) and is passed to llm.with_structured_output(), so providers
+return validated objects instead of free text we have to regex out.
+"""
+
+from __future__ import annotations
+from pydantic import BaseModel, Field
+
+
+class AnalyzerOutput(BaseModel):
+    risk_score: int = Field(ge=0, le=10, description="0-3 noise, 4-6 suspicious, 7-9 high threat, 10 active breach")
+    found_indicators: list[str] = Field(default_factory=list, description="IPs, hashes, domains, usernames, URLs")
+    threat_summary: str = Field(default="No summary provided.", description="What was observed and why it is suspicious")
+    indicator_types: dict[str, str] = Field(default_factory=dict, description="indicator → ip|hash|domain|username|url")
+
+
+class InvestigatorOutput(BaseModel):
+    updated_risk_score: int = Field(ge=0, le=10)
+    confirmed_malicious: list[str] = Field(default_factory=list)
+    threat_context: str = Field(default="", description="What TI sources say about these indicators")
+    confidence: str = Field(default="MEDIUM", description="LOW|MEDIUM|HIGH")
+    recommended_actions: list[str] = Field(default_factory=list)
+
+
+class MitigationAction(BaseModel):
+    action_type: str = Field(description="block_ip|block_hash|disable_user|isolate_host|alert_only")
+    target: str = Field(description="The specific IP/hash/user/host")
+    urgency: str = Field(default="SOON", description="IMMEDIATE|SOON|MONITOR")
+    justification: str = ""
+
+
+class MitigatorOutput(BaseModel):
+    mitigation_plan: str = Field(description="Executive summary of the incident and response")
+    actions: list[MitigationAction] = Field(default_factory=list)
+    requires_approval: bool = False
+    estimated_blast_radius: str = ""
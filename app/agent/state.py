@@ -18,11 +18,13 @@ class AgentState(TypedDict):
     found_indicators: list[str]
     requires_approval: bool
     mitigation_plan: str
+    actions: list[dict[str, Any]]
     executed_actions: list[str]
     investigation_results: list[dict[str, Any]]
     current_node: str
 
-    # Identity fields — MUST be echoed by every node via _base(state)
+    # Identity fields — set once in the initial state; LangGraph keeps them
+    # because nodes never return them (no reducer, so absent keys are untouched)
     incident_id: str
     log_source: str
     status: str
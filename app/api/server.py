@@ -8,14 +8,15 @@ Guardian Agent — FastAPI Backend v2 with:
 from __future__ import annotations
 import asyncio
 import os
+import sys
 import uuid
-from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Any
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Depends
+import orjson
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Depends, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
@@ -37,9 +38,12 @@ app.add_middleware(CORSMiddleware,
     allow_headers=["*"],
 )
 
-_executor = ThreadPoolExecutor(max_workers=4)
-_ws_clients: dict[str, list[WebSocket]] = {}
-_main_loop: asyncio.AbstractEventLoop | None = None
+_ws_clients: dict[str, set[WebSocket]] = {}
+_ws_keys: dict[WebSocket, set[str]] = {}      # reverse index: client → subscribed keys
+_background_tasks: set[asyncio.Task] = set()
+_event_queue: asyncio.Queue[tuple[str, dict[str, Any]]] = asyncio.Queue()
+_dispatcher_task: asyncio.Task | None = None
+_inflight_ids: set[str] = set()                # incidents spawned but possibly not yet stored
 
 
 # ---------------------------------------------------------------------------
@@ -63,31 +67,62 @@ def _now():
     return datetime.now(timezone.utc).isoformat()
 
 
+def _subscribe(ws: WebSocket, key: str) -> None:
+    _ws_clients.setdefault(key, set()).add(ws)
+    _ws_keys.setdefault(ws, set()).add(key)
+
+
+def _unsubscribe(ws: WebSocket) -> None:
+    for key in _ws_keys.pop(ws, ()):
+        clients = _ws_clients.get(key)
+        if clients is not None:
+            clients.discard(ws)
+            if not clients:
+                del _ws_clients[key]
+
+
 async def _broadcast(incident_id: str, event: dict[str, Any]):
-    import json
-    clients = _ws_clients.get(incident_id, []) + _ws_clients.get("*", [])
-    dead = []
-    for ws in clients:
+    clients = [*_ws_clients.get(incident_id, ()), *_ws_clients.get("*", ())]
+    if not clients:
+        return
+    payload = orjson.dumps(event).decode()
+    results = await asyncio.gather(*(ws.send_text(payload) for ws in clients), return_exceptions=True)
+    for ws, res in zip(clients, results):
+        if isinstance(res, Exception):
+            _unsubscribe(ws)
+
+
+def _spawn(coro) -> asyncio.Task:
+    """Run a coroutine in the background, holding a strong reference until it finishes."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+def _publish(incident_id: str, event: dict[str, Any]) -> None:
+    """Queue an event for websocket fan-out — never waits on client I/O."""
+    _event_queue.put_nowait((incident_id, event))
+
+
+async def _event_dispatcher():
+    while True:
+        incident_id, event = await _event_queue.get()
         try:
-            await ws.send_text(json.dumps(event))
-        except Exception:
-            dead.append(ws)
-    for ws in dead:
-        for key in list(_ws_clients.keys()):
-            try: _ws_clients[key].remove(ws)
-            except ValueError: pass
-
-
-def _run_agent(incident_id: str, raw_log: str, log_source: str):
-    import asyncio
-    from app.agent.graph import build_graph
-    from app.memory.store import save_incident
+            await _broadcast(incident_id, event)
+        except Exception as e:
+            print(f"  ⚠️  [WS] Broadcast error: {e}")
+
+
+async def _run_agent(incident_id: str, raw_log: str, log_source: str):
+    from app.agent.graph import forget_incident, get_compiled_graph
+    from app.memory.store import save_incident, save_incident_delta
     from app.notifications.notifier import notify_incident_created, notify_approval_needed, notify_incident_complete
 
     initial_state = {
         "messages": [], "raw_log": raw_log,
         "risk_score": 0, "found_indicators": [],
-        "requires_approval": False, "mitigation_plan": "",
+        "requires_approval": False, "mitigation_plan": "", "actions": [],
         "executed_actions": [], "investigation_results": [],
         "current_node": "start", "incident_id": incident_id,
         "log_source": log_source, "status": "analyzing",
@@ -101,24 +136,32 @@ def _run_agent(incident_id: str, raw_log: str, log_source: str):
     notify_incident_created(initial_state)
 
     os.environ["GUARDIAN_MODE"] = "web"
-    graph = build_graph()
+    graph = get_compiled_graph()
     config = {"configurable": {"thread_id": incident_id}}
 
     prev_status = None
-    for step in graph.stream(initial_state, config=config, stream_mode="values"):
-        events = step.get("stream_events", [])
-        for event in events:
-            try:
-                future = asyncio.run_coroutine_threadsafe(_broadcast(incident_id, event), _main_loop)
-                future.result(timeout=2)
-            except Exception:
-                pass
-
-        # Notify when approval needed
-        current_status = step.get("status", "")
-        if current_status == "awaiting_approval" and prev_status != "awaiting_approval":
-            notify_approval_needed({**initial_state, **step})
-        prev_status = current_status
+    try:
+        async for step in graph.astream(initial_state, config=config, stream_mode="values"):
+            events = step.get("stream_events", [])
+            for event in events:
+                _publish(incident_id, event)
+
+            # Notify when approval needed
+            current_status = step.get("status", "")
+            if current_status == "awaiting_approval" and prev_status != "awaiting_approval":
+                notify_approval_needed({**initial_state, **step})
+            prev_status = current_status
+    except Exception as e:
+        print(f"  ❌ [API] Incident {incident_id} failed: {e}")
+        save_incident_delta(incident_id, {"status": "error", "completed_at": _now()})
+        _publish(incident_id, {"type": "error", "incident_id": incident_id, "error": str(e)})
+        return
+    finally:
+        # The finished run's state lives in the incident store; its checkpoints are dead weight
+        try:
+            await forget_incident(incident_id)
+        except Exception as e:
+            print(f"  ⚠️  [API] Could not drop checkpoints for {incident_id}: {e}")
 
     # Notify: incident complete
     from app.memory.store import get_incident
@@ -133,10 +176,16 @@ def _run_agent(incident_id: str, raw_log: str, log_source: str):
 
 @app.on_event("startup")
 async def startup():
-    global _main_loop
-    _main_loop = asyncio.get_event_loop()
+    global _dispatcher_task
+    from app.log import configure_logging
+    configure_logging()
+    _dispatcher_task = asyncio.create_task(_event_dispatcher())
+    from app.notifications.notifier import start_notify_worker
+    start_notify_worker()
     from app.memory.store import init_db
     init_db()
+    from app.agent.graph import open_graph
+    await open_graph()
     from app.scheduler.cron import start_scheduler
     start_scheduler()
     print("🛡️  Guardian API v2.1 started")
@@ -146,6 +195,23 @@ async def startup():
 async def shutdown():
     from app.scheduler.cron import stop_scheduler
     stop_scheduler()
+    if _dispatcher_task:
+        _dispatcher_task.cancel()
+    from app.memory.store import flush_incidents
+    flush_incidents()
+    from app.notifications.notifier import stop_notify_worker, close_clients
+    stop_notify_worker()
+    await close_clients()
+    from app.tools.threat_intel import close_client
+    await close_client()
+    from app.agent.graph import close_graph
+    await close_graph()
+    # Only if a PDF was ever exported — importing the generator would load all of ReportLab
+    generator = sys.modules.get("app.reports.generator")
+    if generator is not None:
+        generator.shutdown_pdf_pool()
+    from app.log import stop_logging
+    stop_logging()
 
 
 # ---------------------------------------------------------------------------
@@ -193,7 +259,7 @@ async def scheduler_status():
 async def trigger_scan():
     """Manually trigger a scheduler scan."""
     from app.scheduler.cron import scan_and_submit
-    asyncio.get_event_loop().run_in_executor(_executor, scan_and_submit)
+    asyncio.get_event_loop().run_in_executor(None, scan_and_submit)
     return {"message": "Scan triggered"}
 
 
@@ -202,9 +268,15 @@ async def trigger_scan():
 # ---------------------------------------------------------------------------
 
 @app.get("/api/incidents")
-async def list_incidents(limit: int = 50, offset: int = 0, status: str | None = None, min_risk: int = 0):
-    from app.memory.store import list_incidents
-    return {"incidents": list_incidents(limit=limit, offset=offset, status=status, min_risk=min_risk)}
+async def list_incidents(limit: int = 50, offset: int = 0, status: str | None = None, min_risk: int = 0,
+                         summary: bool = False, layout: str = "rows"):
+    """layout=columnar returns the summary columns as {column: [values...]} instead of a list of rows."""
+    from app.memory.store import list_incidents, list_incidents_summary, list_incidents_columnar
+    if layout == "columnar":
+        fetch = list_incidents_columnar
+    else:
+        fetch = list_incidents_summary if summary else list_incidents
+    return {"incidents": fetch(limit=limit, offset=offset, status=status, min_risk=min_risk)}
 
 
 @app.get("/api/incidents/pending-approval")
@@ -223,35 +295,53 @@ async def get_incident(incident_id: str):
 
 
 @app.post("/api/incidents", status_code=202)
-async def submit_log(req: SubmitLogRequest):
-    incident_id = str(uuid.uuid4())
-    asyncio.get_event_loop().run_in_executor(_executor, _run_agent, incident_id, req.raw_log, req.log_source)
+async def submit_log(req: SubmitLogRequest, idempotency_key: str | None = Header(default=None)):
+    if not idempotency_key:
+        incident_id = str(uuid.uuid4())
+    else:
+        # Same key → same incident id, so a client retry never opens a duplicate incident
+        incident_id = str(uuid.uuid5(uuid.NAMESPACE_URL, f"guardian:incident:{idempotency_key}"))
+        if incident_id in _inflight_ids:
+            return {"incident_id": incident_id, "status": "analyzing"}
+        from app.memory.store import get_incident
+        existing = get_incident(incident_id)
+        if existing:
+            return {"incident_id": incident_id, "status": existing.get("status", "analyzing")}
+
+    _inflight_ids.add(incident_id)
+    _spawn(_run_agent(incident_id, req.raw_log, req.log_source)).add_done_callback(
+        lambda _: _inflight_ids.discard(incident_id)
+    )
     return {"incident_id": incident_id, "status": "analyzing"}
 
 
 @app.post("/api/incidents/{incident_id}/approve")
 async def approve_incident(incident_id: str):
     from app.memory.store import set_approval, get_incident
+    from app.agent.graph import signal_approval
     inc = get_incident(incident_id)
     if not inc:
         raise HTTPException(status_code=404, detail="Incident not found")
     if inc.get("status") != "awaiting_approval":
         raise HTTPException(status_code=400, detail=f"Incident is not awaiting approval (status: {inc.get('status')})")
     set_approval(incident_id, "approved")
-    await _broadcast(incident_id, {"type": "approval_decision", "incident_id": incident_id, "approved": True})
+    signal_approval(incident_id, True)
+    _publish(incident_id, {"type": "approval_decision", "incident_id": incident_id, "approved": True})
     return {"message": "Approved. Executing mitigation actions."}
 
 
 @app.post("/api/incidents/{incident_id}/deny")
 async def deny_incident(incident_id: str):
     from app.memory.store import set_approval, get_incident
+    from app.agent.graph import signal_approval
     inc = get_incident(incident_id)
     if not inc:
         raise HTTPException(status_code=404, detail="Incident not found")
     if inc.get("status") != "awaiting_approval":
         raise HTTPException(status_code=400, detail=f"Incident is not awaiting approval (status: {inc.get('status')})")
     set_approval(incident_id, "denied")
-    await _broadcast(incident_id, {"type": "approval_decision", "incident_id": incident_id, "approved": False})
+    signal_approval(incident_id, False)
+    _publish(incident_id, {"type": "approval_decision", "incident_id": incident_id, "approved": False})
     return {"message": "Denied. Logging alert only."}
 
 
@@ -259,23 +349,31 @@ async def deny_incident(incident_id: str):
 # PDF Export
 # ---------------------------------------------------------------------------
 
+_PDF_CHUNK_SIZE = 64 * 1024
+
+
 @app.get("/api/incidents/{incident_id}/report.pdf")
 async def export_pdf(incident_id: str):
     from app.memory.store import get_incident
-    from app.reports.generator import generate_incident_pdf
+    from app.reports.generator import generate_incident_pdf_async
     inc = get_incident(incident_id)
     if not inc:
         raise HTTPException(status_code=404, detail="Incident not found")
     try:
-        pdf_bytes = generate_incident_pdf(inc)
-        return Response(
-            content=pdf_bytes,
-            media_type="application/pdf",
-            headers={"Content-Disposition": f"attachment; filename=guardian-incident-{incident_id[:8]}.pdf"}
-        )
+        pdf = await generate_incident_pdf_async(inc)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"PDF generation failed: {e}")
 
+    def _chunks():
+        for i in range(0, len(pdf), _PDF_CHUNK_SIZE):
+            yield pdf[i:i + _PDF_CHUNK_SIZE]
+
+    return StreamingResponse(
+        _chunks(),
+        media_type="application/pdf",
+        headers={"Content-Disposition": f"attachment; filename=guardian-incident-{incident_id[:8]}.pdf"}
+    )
+
 
 # ---------------------------------------------------------------------------
 # WebSocket
@@ -284,27 +382,24 @@ async def export_pdf(incident_id: str):
 @app.websocket("/ws/incidents")
 async def websocket_all(websocket: WebSocket):
     await websocket.accept()
-    _ws_clients.setdefault("*", []).append(websocket)
+    _subscribe(websocket, "*")
     try:
         while True:
             await websocket.receive_text()
     except WebSocketDisconnect:
-        try: _ws_clients["*"].remove(websocket)
-        except ValueError: pass
+        _unsubscribe(websocket)
 
 
 @app.websocket("/ws/incidents/{incident_id}")
 async def websocket_incident(websocket: WebSocket, incident_id: str):
     await websocket.accept()
-    _ws_clients.setdefault(incident_id, []).append(websocket)
+    _subscribe(websocket, incident_id)
     from app.memory.store import get_incident
-    import json
     inc = get_incident(incident_id)
     if inc:
-        await websocket.send_text(json.dumps({"type": "current_state", **inc}))
+        await websocket.send_text(orjson.dumps({"type": "current_state", **inc}).decode())
     try:
         while True:
             await websocket.receive_text()
     except WebSocketDisconnect:
-        try: _ws_clients[incident_id].remove(websocket)
-        except ValueError: pass
\ No newline at end of file
+        _unsubscribe(websocket)
\ No newline at end of file
@@ -8,23 +8,26 @@ Configure via .env:
 
 Features:
   - Single admin user (expandable to multi-user)
-  - Bcrypt password hashing
+  - PBKDF2-SHA256 password hashes (GUARDIAN_ADMIN_PASS_HASH)
   - JWT tokens with 8-hour expiry
   - FastAPI dependency for protecting routes
 """
 
 from __future__ import annotations
-import os
+import functools
 import hashlib
 import hmac
-import json
 import base64
+import secrets
 import time
 from typing import Any
 
+import orjson
 from fastapi import HTTPException, Security, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+from app.config import CFG
+
 _security = HTTPBearer(auto_error=False)
 
 # ---------------------------------------------------------------------------
@@ -36,60 +39,72 @@ def _b64_encode(data: bytes) -> str:
 
 
 def _b64_decode(s: str) -> bytes:
-    padding = 4 - len(s) % 4
-    return base64.urlsafe_b64decode(s + "=" * padding)
+    # Excess padding is ignored by the decoder, so always append the maximum
+    return base64.urlsafe_b64decode(s + "===")
+
+
+_DEFAULT_SECRET = "guardian-default-secret-CHANGE-THIS"
+_SECRET = CFG.jwt_secret
+if _SECRET == _DEFAULT_SECRET:
+    print("  ⚠️  [AUTH] Using default JWT secret — set GUARDIAN_JWT_SECRET in .env")
 
+_SECRET_BYTES = _SECRET.encode()
+_HEADER_B64 = "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9"  # base64url of {"alg":"HS256","typ":"JWT"}
 
-def _get_secret() -> str:
-    secret = os.getenv("GUARDIAN_JWT_SECRET", "guardian-default-secret-CHANGE-THIS")
-    if secret == "guardian-default-secret-CHANGE-THIS":
-        print("  ⚠️  [AUTH] Using default JWT secret — set GUARDIAN_JWT_SECRET in .env")
-    return secret
+
+def _sign(message: bytes) -> bytes:
+    # One-shot OpenSSL HMAC — no Python-level HMAC object per token
+    return hmac.digest(_SECRET_BYTES, message, "sha256")
 
 
 def create_token(username: str) -> str:
     """Create a JWT token valid for 8 hours."""
-    header = _b64_encode(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
-    payload = _b64_encode(json.dumps({
+    header = _HEADER_B64
+    now = int(time.time())
+    payload = _b64_encode(orjson.dumps({
         "sub": username,
-        "iat": int(time.time()),
-        "exp": int(time.time()) + 8 * 3600,  # 8 hours
-    }).encode())
-    signature = _b64_encode(
-        hmac.new(
-            _get_secret().encode(),
-            f"{header}.{payload}".encode(),
-            hashlib.sha256,
-        ).digest()
-    )
+        "iat": now,
+        "exp": now + 8 * 3600,  # 8 hours
+    }))
+    signature = _b64_encode(_sign(f"{header}.{payload}".encode()))
     return f"{header}.{payload}.{signature}"
 
 
+@functools.lru_cache(maxsize=1024)
+def _verified_claims(token: str) -> dict[str, Any]:
+    """Decode + signature-check a token once; repeat requests with the same token hit the cache."""
+    parts = token.split(".")
+    if len(parts) != 3:
+        raise ValueError("Invalid token format")
+    header, payload, signature = parts
+
+    # Cheap reject for stale tokens before doing any HMAC work — the payload is
+    # untrusted until the signature checks out, so validate its shape first
+    data = orjson.loads(_b64_decode(payload))
+    if not isinstance(data, dict) or "sub" not in data:
+        raise ValueError("Token missing required claims")
+    exp = data.get("exp")
+    if isinstance(exp, bool) or not isinstance(exp, (int, float)):
+        raise ValueError("Token missing required claims")
+    if exp < time.time():
+        raise ValueError("Token expired")
+
+    # Compare canonical base64url text: decoding the presented signature would
+    # accept padding and non-alphabet variants of a valid one
+    expected = _b64_encode(_sign(f"{header}.{payload}".encode()))
+    if not hmac.compare_digest(signature, expected):
+        raise ValueError("Invalid signature")
+    return data
+
+
 def verify_token(token: str) -> dict[str, Any]:
     """Verify a JWT token. Returns payload or raises HTTPException."""
     try:
-        parts = token.split(".")
-        if len(parts) != 3:
-            raise ValueError("Invalid token format")
-        header, payload, signature = parts
-
-        # Verify signature
-        expected = _b64_encode(
-            hmac.new(
-                _get_secret().encode(),
-                f"{header}.{payload}".encode(),
-                hashlib.sha256,
-            ).digest()
-        )
-        if not hmac.compare_digest(signature, expected):
-            raise ValueError("Invalid signature")
-
-        # Verify expiry
-        data = json.loads(_b64_decode(payload))
+        data = _verified_claims(token)
+        # Cached entries outlive their exp, so re-check it on every call
         if data.get("exp", 0) < time.time():
             raise ValueError("Token expired")
-
-        return data
+        return dict(data)
     except ValueError as e:
         raise HTTPException(status_code=401, detail=str(e))
 
@@ -98,19 +113,39 @@ def verify_token(token: str) -> dict[str, Any]:
 # Password verification
 # ---------------------------------------------------------------------------
 
-def _hash_password(password: str) -> str:
-    """Simple SHA-256 hash with salt (use bcrypt in production)."""
-    salt = os.getenv("GUARDIAN_JWT_SECRET", "salt")[:16]
-    return hashlib.sha256(f"{salt}{password}".encode()).hexdigest()
+_PBKDF2_ITERATIONS = 100_000
+
+
+def _hash_password(password: str, salt: str | None = None, iterations: int = _PBKDF2_ITERATIONS) -> str:
+    """PBKDF2-HMAC-SHA256, encoded as pbkdf2_sha256$<iterations>$<salt>$<hex digest>."""
+    salt = salt or secrets.token_hex(16)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt.encode(), iterations, dklen=32).hex()
+    return f"pbkdf2_sha256${iterations}${salt}${digest}"
+
+
+def _check_password(password: str, encoded: str) -> bool:
+    try:
+        algo, iterations, salt, _ = encoded.split("$")
+        if algo != "pbkdf2_sha256":
+            return False
+        return hmac.compare_digest(_hash_password(password, salt, int(iterations)), encoded)
+    except ValueError:
+        return False
 
 
 def verify_credentials(username: str, password: str) -> bool:
-    """Verify username and password against .env config."""
-    expected_user = os.getenv("GUARDIAN_ADMIN_USER", "admin")
-    expected_pass = os.getenv("GUARDIAN_ADMIN_PASS", "guardian123")
+    """
+    Verify username and password against .env config.
+    GUARDIAN_ADMIN_PASS_HASH (output of _hash_password) takes precedence over plaintext GUARDIAN_ADMIN_PASS.
+    """
+    expected_user = CFG.admin_user
+    expected_hash = CFG.admin_pass_hash
 
     user_ok = hmac.compare_digest(username.strip(), expected_user.strip())
-    pass_ok = hmac.compare_digest(password, expected_pass)
+    if expected_hash:
+        pass_ok = _check_password(password, expected_hash)
+    else:
+        pass_ok = hmac.compare_digest(password, CFG.admin_pass)
     return user_ok and pass_ok
 
 
@@ -123,7 +158,7 @@ def get_current_user(
 ) -> dict[str, Any]:
     """FastAPI dependency — use on protected routes."""
     # If auth is disabled, allow all
-    if os.getenv("GUARDIAN_AUTH_ENABLED", "false").lower() not in ("true", "1"):
+    if not CFG.auth_enabled:
         return {"sub": "anonymous", "auth_disabled": True}
 
     if not credentials:
@@ -0,0 +1,67 @@
+"""
+Guardian config — environment settings read once at import.
+
+Env vars don't change at runtime, so auth and notification hot paths read
+attributes off CFG instead of calling os.getenv() and re-parsing flags per call.
+"""
+
+from __future__ import annotations
+import os
+from dataclasses import dataclass
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _flag(name: str, default: str = "") -> bool:
+    return os.getenv(name, default).lower() in ("true", "1")
+
+
+@dataclass(frozen=True)
+class Config:
+    # Auth
+    auth_enabled: bool
+    admin_user: str
+    admin_pass: str
+    admin_pass_hash: str
+    jwt_secret: str
+
+    # Slack
+    slack_enabled: bool
+    slack_webhook_url: str
+
+    # Email
+    email_enabled: bool
+    smtp_host: str
+    smtp_port: int
+    smtp_user: str
+    smtp_pass: str
+    email_from: str
+    email_to: str
+
+    dashboard_url: str
+
+
+def _load() -> Config:
+    smtp_user = os.getenv("EMAIL_SMTP_USER", "")
+    return Config(
+        auth_enabled=_flag("GUARDIAN_AUTH_ENABLED", "false"),
+        admin_user=os.getenv("GUARDIAN_ADMIN_USER", "admin"),
+        admin_pass=os.getenv("GUARDIAN_ADMIN_PASS", "guardian123"),
+        admin_pass_hash=os.getenv("GUARDIAN_ADMIN_PASS_HASH", ""),
+        jwt_secret=os.getenv("GUARDIAN_JWT_SECRET", "guardian-default-secret-CHANGE-THIS"),
+        slack_enabled=_flag("SLACK_ENABLED"),
+        slack_webhook_url=os.getenv("SLACK_WEBHOOK_URL", ""),
+        email_enabled=_flag("EMAIL_ENABLED"),
+        smtp_host=os.getenv("EMAIL_SMTP_HOST", "smtp.gmail.com"),
+        smtp_port=int(os.getenv("EMAIL_SMTP_PORT", "587")),
+        smtp_user=smtp_user,
+        smtp_pass=os.getenv("EMAIL_SMTP_PASS", ""),
+        email_from=os.getenv("EMAIL_FROM", smtp_user),
+        email_to=os.getenv("EMAIL_TO", ""),
+        dashboard_url=os.getenv("DASHBOARD_URL", "http://localhost:3000"),
+    )
+
+
+CFG = _load()
@@ -0,0 +1,42 @@
+"""
+Logging setup — queue-buffered so agent nodes never block on stderr.
+
+Records are enqueued by a QueueHandler on the root logger and written to
+stderr by a single QueueListener thread, so concurrent incidents don't
+serialize on the stream lock.
+
+Provides:
+  - configure_logging() : Install the queue handler + listener (idempotent)
+  - stop_logging()      : Flush and stop the listener
+"""
+
+from __future__ import annotations
+import logging
+import logging.handlers
+import os
+import queue
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+def configure_logging(level: str | None = None) -> None:
+    global _listener
+    if _listener is not None:
+        return
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    logging.basicConfig(
+        level=level or os.getenv("GUARDIAN_LOG_LEVEL", "INFO"),
+        handlers=[logging.handlers.QueueHandler(log_queue)],
+        force=True,
+    )
+    _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -2,22 +2,32 @@
 Incident memory store — SQLite-backed persistence for all Guardian incidents.
 
 Provides:
-  - save_incident()       : Upsert full incident state
+  - save_incident()       : Upsert full incident state (buffered)
+  - save_incidents_batch(): Upsert many incidents in one transaction
+  - flush_incidents()     : Write out buffered upserts
+  - save_incident_delta() : Update only the columns a node changed
   - get_incident()        : Fetch one incident by ID
   - list_incidents()      : Paginated list with filters
+  - list_incidents_summary(): Same, scalar columns only
+  - list_incidents_columnar(): Scalar columns as a dict of lists
   - get_stats()           : Dashboard summary counts
   - set_approval()        : Write approval decision (used by API)
   - get_pending_approval(): Fetch incidents awaiting human decision
 """
 
 from __future__ import annotations
-import json
+import functools
 import sqlite3
 import os
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+import orjson
+import zstandard
+
 DB_PATH = Path(os.getenv("GUARDIAN_STATE_DIR", "/tmp")) / "guardian_incidents.db"
 
 # On Railway, use /data volume if available (persistent storage)
@@ -25,15 +35,81 @@ if Path("/data").exists():
     DB_PATH = Path("/data/guardian_incidents.db")
 
 
+# JSON columns and raw_log are stored as zstd-compressed BLOBs. Rows written before
+# this change hold plain TEXT and are still decoded as-is. zstd contexts aren't
+# thread-safe, so each thread keeps its own.
+_zstd_local = threading.local()
+
+
+def _compressor() -> zstandard.ZstdCompressor:
+    c = getattr(_zstd_local, "compressor", None)
+    if c is None:
+        c = _zstd_local.compressor = zstandard.ZstdCompressor(level=3)
+    return c
+
+
+def _decompressor() -> zstandard.ZstdDecompressor:
+    d = getattr(_zstd_local, "decompressor", None)
+    if d is None:
+        d = _zstd_local.decompressor = zstandard.ZstdDecompressor()
+    return d
+
+
+def _pack(value: Any) -> bytes:
+    return _compressor().compress(orjson.dumps(value))
+
+
+def _unpack(stored: bytes | str | None) -> Any:
+    if isinstance(stored, bytes):
+        return orjson.loads(_decompressor().decompress(stored))
+    return orjson.loads(stored or "[]")
+
+
+def _pack_text(text: str) -> bytes:
+    return _compressor().compress(text.encode())
+
+
+def _unpack_text(stored: bytes | str | None) -> str:
+    if isinstance(stored, bytes):
+        return _decompressor().decompress(stored).decode()
+    return stored or ""
+
+
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",      # 64 MiB page cache
+    "PRAGMA mmap_size=268435456",    # 256 MiB
+    "PRAGMA busy_timeout=5000",
+)
+
+# One tuned connection per process, shared across threads under _DB_LOCK
+_conn: sqlite3.Connection | None = None
+_DB_LOCK = threading.RLock()
+
+
 def _connect() -> sqlite3.Connection:
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Return the shared connection (caller must hold _DB_LOCK)."""
+    global _conn
+    if _conn is None:
+        conn = sqlite3.connect(str(DB_PATH), check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma in _PRAGMAS:
+            conn.execute(pragma)
+        _conn = conn
+    return _conn
+
+
+_DB_READY = False
 
 
 def init_db() -> None:
-    """Create tables if they don't exist."""
-    with _connect() as conn:
+    """Create tables if they don't exist (once per process)."""
+    global _DB_READY
+    if _DB_READY:
+        return
+    with _DB_LOCK, _connect() as conn:
         conn.execute("""
             CREATE TABLE IF NOT EXISTS incidents (
                 id TEXT PRIMARY KEY,
@@ -57,109 +133,248 @@ def init_db() -> None:
         conn.execute("CREATE INDEX IF NOT EXISTS idx_status ON incidents(status)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_risk ON incidents(risk_score)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_created ON incidents(created_at)")
+        # list_incidents(status=...): seek on status, walk created_at in order, filter risk_score from the index
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_status_created_risk ON incidents(status, created_at DESC, risk_score)"
+        )
         conn.commit()
+        _DB_READY = True
+
+
+_UPSERT_SQL = """
+    INSERT INTO incidents (
+        id, log_source, raw_log, risk_score, status,
+        found_indicators, investigation_results, mitigation_plan,
+        executed_actions, requires_approval, approval_token,
+        approval_decision, started_at, completed_at, stream_events
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        risk_score = excluded.risk_score,
+        status = excluded.status,
+        found_indicators = excluded.found_indicators,
+        investigation_results = excluded.investigation_results,
+        mitigation_plan = excluded.mitigation_plan,
+        executed_actions = excluded.executed_actions,
+        requires_approval = excluded.requires_approval,
+        approval_token = excluded.approval_token,
+        approval_decision = excluded.approval_decision,
+        started_at = excluded.started_at,
+        completed_at = excluded.completed_at,
+        stream_events = excluded.stream_events
+"""
+
+# Upserts are buffered and written in one transaction; every read/update flushes first
+_WRITE_BUFFER: list[tuple] = []
+_BUFFER_LOCK = threading.Lock()
+_BUFFER_MAX_ROWS = 50
+_BUFFER_MAX_AGE = 0.5  # seconds
+_last_flush = time.monotonic()
+
+
+def _incident_row(state: dict[str, Any]) -> tuple:
+    return (
+        state.get("incident_id", ""),
+        state.get("log_source", "unknown"),
+        _pack_text(state.get("raw_log", "")),
+        state.get("risk_score", 0),
+        state.get("status", "pending"),
+        _pack(state.get("found_indicators", [])),
+        _pack(state.get("investigation_results", [])),
+        _strip_actions(state.get("mitigation_plan", "")),
+        _pack(state.get("executed_actions", [])),
+        1 if state.get("requires_approval") else 0,
+        state.get("approval_token", ""),
+        state.get("approval_decision", "pending"),
+        state.get("started_at", ""),
+        state.get("completed_at", ""),
+        _pack(state.get("stream_events", [])),
+    )
+
+
+def flush_incidents() -> None:
+    """Write all buffered upserts in a single transaction; on failure they stay buffered and it raises."""
+    global _last_flush
+    with _BUFFER_LOCK:
+        if not _WRITE_BUFFER:
+            _last_flush = time.monotonic()
+            return
+        init_db()
+        with _DB_LOCK, _connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(_UPSERT_SQL, _WRITE_BUFFER)
+            conn.commit()
+        # Only drop rows once they're committed (appends wait on _BUFFER_LOCK meanwhile)
+        _WRITE_BUFFER.clear()
+        _last_flush = time.monotonic()
+
+
+def _flush_quietly() -> None:
+    """Opportunistic flush for reads and buffered saves — a failed write is retried by the next flush
+    rather than surfacing in an unrelated caller."""
+    try:
+        flush_incidents()
+    except sqlite3.Error as e:
+        print(f"  ⚠️  [STORE] Incident flush failed, keeping {len(_WRITE_BUFFER)} row(s) buffered: {e}")
 
 
 def save_incident(state: dict[str, Any]) -> None:
-    """Upsert an incident from agent state."""
+    """Upsert an incident from agent state (buffered — flushed by size, age, or the next read)."""
+    with _BUFFER_LOCK:
+        _WRITE_BUFFER.append(_incident_row(state))
+        due = len(_WRITE_BUFFER) >= _BUFFER_MAX_ROWS or time.monotonic() - _last_flush > _BUFFER_MAX_AGE
+    if due:
+        _flush_quietly()
+
+
+def save_incidents_batch(states: list[dict[str, Any]]) -> None:
+    """Upsert many incidents in one transaction."""
+    with _BUFFER_LOCK:
+        _WRITE_BUFFER.extend(_incident_row(s) for s in states)
+    flush_incidents()
+
+
+# state key → encoder for the column of the same name
+_JSON_COLUMNS = ("found_indicators", "investigation_results", "executed_actions", "stream_events")
+_DELTA_ENCODERS = {
+    "log_source": str,
+    "raw_log": lambda v: _pack_text(v or ""),
+    "risk_score": int,
+    "status": str,
+    "mitigation_plan": lambda v: _strip_actions(v or ""),
+    "requires_approval": lambda v: 1 if v else 0,
+    "approval_token": str,
+    "approval_decision": str,
+    "started_at": str,
+    "completed_at": str,
+    **{col: _pack for col in _JSON_COLUMNS},
+}
+
+
+def save_incident_delta(incident_id: str, fields: dict[str, Any]) -> None:
+    """UPDATE only the incident columns present in `fields` (keys without a column are ignored)."""
+    cols = [k for k in fields if k in _DELTA_ENCODERS]
+    if not cols:
+        return
+    flush_incidents()
     init_db()
-    with _connect() as conn:
-        conn.execute("""
-            INSERT INTO incidents (
-                id, log_source, raw_log, risk_score, status,
-                found_indicators, investigation_results, mitigation_plan,
-                executed_actions, requires_approval, approval_token,
-                approval_decision, started_at, completed_at, stream_events
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(id) DO UPDATE SET
-                risk_score = excluded.risk_score,
-                status = excluded.status,
-                found_indicators = excluded.found_indicators,
-                investigation_results = excluded.investigation_results,
-                mitigation_plan = excluded.mitigation_plan,
-                executed_actions = excluded.executed_actions,
-                requires_approval = excluded.requires_approval,
-                approval_token = excluded.approval_token,
-                approval_decision = excluded.approval_decision,
-                started_at = excluded.started_at,
-                completed_at = excluded.completed_at,
-                stream_events = excluded.stream_events
-        """, (
-            state.get("incident_id", ""),
-            state.get("log_source", "unknown"),
-            state.get("raw_log", ""),
-            state.get("risk_score", 0),
-            state.get("status", "pending"),
-            json.dumps(state.get("found_indicators", [])),
-            json.dumps(state.get("investigation_results", [])),
-            _strip_actions(state.get("mitigation_plan", "")),
-            json.dumps(state.get("executed_actions", [])),
-            1 if state.get("requires_approval") else 0,
-            state.get("approval_token", ""),
-            state.get("approval_decision", "pending"),
-            state.get("started_at", ""),
-            state.get("completed_at", ""),
-            json.dumps(state.get("stream_events", [])),
-        ))
+    with _DB_LOCK, _connect() as conn:
+        conn.execute(
+            f"UPDATE incidents SET {', '.join(f'{c} = ?' for c in cols)} WHERE id = ?",
+            (*(_DELTA_ENCODERS[c](fields[c]) for c in cols), incident_id),
+        )
         conn.commit()
 
 
 def get_incident(incident_id: str) -> dict[str, Any] | None:
+    _flush_quietly()
     init_db()
-    with _connect() as conn:
+    with _DB_LOCK, _connect() as conn:
         row = conn.execute("SELECT * FROM incidents WHERE id = ?", (incident_id,)).fetchone()
         return _row_to_dict(row) if row else None
 
 
+_SUMMARY_COLUMNS = (
+    "id, log_source, risk_score, status, requires_approval, approval_decision, "
+    "started_at, completed_at, created_at"
+)
+
+
+def _list_sql(columns: str) -> tuple[str, str]:
+    """(without status filter, with status filter) — fixed strings keep sqlite3's statement cache hot."""
+    select = f"SELECT {columns} FROM incidents WHERE risk_score >= ?"
+    order = " ORDER BY created_at DESC LIMIT ? OFFSET ?"
+    return select + order, select + " AND status = ?" + order
+
+
+_LIST_SQL = _list_sql("*")
+_LIST_SUMMARY_SQL = _list_sql(_SUMMARY_COLUMNS)
+
+
+def _list_rows(sql: tuple[str, str], limit: int, offset: int, status: str | None, min_risk: int) -> list[sqlite3.Row]:
+    _flush_quietly()
+    init_db()
+    with _DB_LOCK, _connect() as conn:
+        if status:
+            return conn.execute(sql[1], (min_risk, status, limit, offset)).fetchall()
+        return conn.execute(sql[0], (min_risk, limit, offset)).fetchall()
+
+
 def list_incidents(
     limit: int = 50,
     offset: int = 0,
     status: str | None = None,
     min_risk: int = 0,
 ) -> list[dict[str, Any]]:
-    init_db()
-    query = "SELECT * FROM incidents WHERE risk_score >= ?"
-    params: list[Any] = [min_risk]
-    if status:
-        query += " AND status = ?"
-        params.append(status)
-    query += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
-    params += [limit, offset]
-    with _connect() as conn:
-        rows = conn.execute(query, params).fetchall()
-        return [_row_to_dict(r) for r in rows]
+    return [_row_to_dict(r) for r in _list_rows(_LIST_SQL, limit, offset, status, min_risk)]
+
+
+def list_incidents_summary(
+    limit: int = 50,
+    offset: int = 0,
+    status: str | None = None,
+    min_risk: int = 0,
+) -> list[dict[str, Any]]:
+    """Like list_incidents(), but only scalar columns — no raw log or JSON columns to decode."""
+    rows = _list_rows(_LIST_SUMMARY_SQL, limit, offset, status, min_risk)
+    return [{**dict(r), "requires_approval": bool(r["requires_approval"])} for r in rows]
+
+
+def list_incidents_columnar(
+    limit: int = 50,
+    offset: int = 0,
+    status: str | None = None,
+    min_risk: int = 0,
+) -> dict[str, list[Any]]:
+    """Summary columns as a dict of lists (one list per column, rows aligned by index)."""
+    rows = _list_rows(_LIST_SUMMARY_SQL, limit, offset, status, min_risk)
+    columns = [c.strip() for c in _SUMMARY_COLUMNS.split(",")]
+    data = dict(zip(columns, map(list, zip(*rows)))) if rows else {c: [] for c in columns}
+    data["requires_approval"] = [bool(v) for v in data["requires_approval"]]
+    return data
+
+
+_STATS_TTL = 1.0  # seconds — the dashboard polls /api/stats
 
 
 def get_stats() -> dict[str, Any]:
+    _flush_quietly()
+    return _stats_cached(int(time.monotonic() / _STATS_TTL))
+
+
+@functools.lru_cache(maxsize=1)
+def _stats_cached(_bucket: int) -> dict[str, Any]:
     init_db()
-    with _connect() as conn:
-        total = conn.execute("SELECT COUNT(*) FROM incidents").fetchone()[0]
+    with _DB_LOCK, _connect() as conn:
+        totals = conn.execute("""
+            SELECT
+                COUNT(*) AS total,
+                SUM(CASE WHEN risk_score >= 7 THEN 1 ELSE 0 END) AS high_risk,
+                SUM(CASE WHEN status = 'awaiting_approval' THEN 1 ELSE 0 END) AS pending_approval,
+                AVG(CASE WHEN risk_score > 0 THEN risk_score END) AS avg_risk
+            FROM incidents
+        """).fetchone()
         by_status = {
             row["status"]: row["count"]
             for row in conn.execute("SELECT status, COUNT(*) as count FROM incidents GROUP BY status").fetchall()
         }
-        high_risk = conn.execute("SELECT COUNT(*) FROM incidents WHERE risk_score >= 7").fetchone()[0]
-        pending_approval = conn.execute(
-            "SELECT COUNT(*) FROM incidents WHERE status = 'awaiting_approval'"
-        ).fetchone()[0]
-        avg_risk = conn.execute("SELECT AVG(risk_score) FROM incidents WHERE risk_score > 0").fetchone()[0] or 0
         recent = conn.execute(
             "SELECT * FROM incidents ORDER BY created_at DESC LIMIT 5"
         ).fetchall()
         return {
-            "total": total,
+            "total": totals["total"],
             "by_status": by_status,
-            "high_risk": high_risk,
-            "pending_approval": pending_approval,
-            "avg_risk_score": round(avg_risk, 1),
+            "high_risk": totals["high_risk"] or 0,
+            "pending_approval": totals["pending_approval"] or 0,
+            "avg_risk_score": round(totals["avg_risk"] or 0, 1),
             "recent_incidents": [_row_to_dict(r) for r in recent],
         }
 
 
 def set_approval(incident_id: str, decision: str) -> bool:
     """Set approval decision: 'approved' or 'denied'."""
+    flush_incidents()
     init_db()
-    with _connect() as conn:
+    with _DB_LOCK, _connect() as conn:
         result = conn.execute(
             "UPDATE incidents SET approval_decision = ?, status = 'executing' WHERE id = ? AND status = 'awaiting_approval'",
             (decision, incident_id),
@@ -179,10 +394,11 @@ def _strip_actions(plan: str) -> str:
 
 def _row_to_dict(row: sqlite3.Row) -> dict[str, Any]:
     d = dict(row)
-    for field in ("found_indicators", "investigation_results", "executed_actions", "stream_events"):
+    for field in _JSON_COLUMNS:
         try:
-            d[field] = json.loads(d.get(field) or "[]")
-        except (json.JSONDecodeError, TypeError):
+            d[field] = _unpack(d.get(field))
+        except (orjson.JSONDecodeError, zstandard.ZstdError, TypeError):
             d[field] = []
+    d["raw_log"] = _unpack_text(d.get("raw_log"))
     d["requires_approval"] = bool(d.get("requires_approval"))
     return d
\ No newline at end of file
@@ -15,43 +15,74 @@ Configure via .env:
 
 Usage:
   from app.notifications.notifier import notify_incident_created, notify_incident_complete
-  notify_incident_created(incident)
+  notify_incident_created(incident)   # queued; sent by the worker started via start_notify_worker()
   notify_incident_complete(incident)
 """
 
 from __future__ import annotations
-import os
+import asyncio
+import base64
+import re
 import smtplib
-import json
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+import threading
+import time
+from email.header import Header
+from email.utils import formatdate, make_msgid
 from datetime import datetime, timezone
 from typing import Any
 
 import httpx
+import orjson
+
+from app.config import CFG
 
 
 def _now() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
 
 
+# Index = risk score 0-10
+_RISK_LABELS = ("🟢 LOW",) * 4 + ("🟡 MEDIUM",) * 3 + ("🟠 HIGH",) * 2 + ("🔴 CRITICAL",) * 2
+
+
 def _risk_label(score: int) -> str:
-    if score >= 9: return "🔴 CRITICAL"
-    if score >= 7: return "🟠 HIGH"
-    if score >= 4: return "🟡 MEDIUM"
-    return "🟢 LOW"
+    return _RISK_LABELS[min(max(score, 0), 10)]
 
 
 # ---------------------------------------------------------------------------
 # Slack
 # ---------------------------------------------------------------------------
 
-def _send_slack(message: dict[str, Any]) -> bool:
-    webhook = os.getenv("SLACK_WEBHOOK_URL", "")
+_slack_client: httpx.AsyncClient | None = None
+
+
+def _get_slack_client() -> httpx.AsyncClient:
+    """Shared HTTP/2 client so repeated webhooks multiplex over one kept-alive TLS connection."""
+    global _slack_client
+    if _slack_client is None:
+        _slack_client = httpx.AsyncClient(
+            http2=True,
+            timeout=10,
+            limits=httpx.Limits(max_keepalive_connections=4),
+        )
+    return _slack_client
+
+
+async def close_clients() -> None:
+    """Close pooled connections (call on app shutdown)."""
+    global _slack_client
+    if _slack_client is not None:
+        await _slack_client.aclose()
+        _slack_client = None
+
+
+async def _send_slack(body: bytes) -> bool:
+    webhook = CFG.slack_webhook_url
     if not webhook:
         return False
     try:
-        resp = httpx.post(webhook, json=message, timeout=10)
+        resp = await _get_slack_client().post(webhook, content=body,
+                                              headers={"Content-Type": "application/json"})
         resp.raise_for_status()
         print(f"  📨 [SLACK] Notification sent")
         return True
@@ -60,148 +91,258 @@ def _send_slack(message: dict[str, Any]) -> bool:
         return False
 
 
-def _slack_incident_created(incident: dict[str, Any]) -> None:
+_SLOT_RE = re.compile(rb'"\{\{(\w+)\}\}"')
+
+
+def _slack_template(message: dict[str, Any]) -> bytes:
+    """
+    Freeze a Slack payload to JSON bytes once. String values written as "{{name}}"
+    become %(name)s slots, filled at send time with JSON-encoded values (see _slots).
+    """
+    return _SLOT_RE.sub(rb"%(\1)s", orjson.dumps(message).replace(b"%", b"%%"))
+
+
+def _slots(**values: Any) -> dict[bytes, bytes]:
+    return {k.encode(): orjson.dumps(v) for k, v in values.items()}
+
+
+_SLACK_CREATED = _slack_template({
+    "text": "{{fallback}}",
+    "blocks": [
+        {
+            "type": "header",
+            "text": {"type": "plain_text", "text": "{{header}}"}
+        },
+        {
+            "type": "section",
+            "fields": [
+                {"type": "mrkdwn", "text": "{{incident_id}}"},
+                {"type": "mrkdwn", "text": "{{risk}}"},
+                {"type": "mrkdwn", "text": "{{source}}"},
+                {"type": "mrkdwn", "text": "{{time}}"},
+            ]
+        },
+        {
+            "type": "section",
+            "text": {"type": "mrkdwn", "text": "{{indicators}}"}
+        },
+        {
+            "type": "actions",
+            "elements": [
+                {
+                    "type": "button",
+                    "text": {"type": "plain_text", "text": "🔍 View Incident"},
+                    "url": "{{dashboard_url}}",
+                    "style": "{{style}}"
+                }
+            ]
+        }
+    ]
+})
+
+_SLACK_COMPLETE = _slack_template({
+    "text": "{{fallback}}",
+    "blocks": [
+        {
+            "type": "header",
+            "text": {"type": "plain_text", "text": "{{header}}"}
+        },
+        {
+            "type": "section",
+            "fields": [
+                {"type": "mrkdwn", "text": "{{incident_id}}"},
+                {"type": "mrkdwn", "text": "{{risk}}"},
+            ]
+        },
+        {
+            "type": "section",
+            "text": {"type": "mrkdwn", "text": "{{actions}}"}
+        }
+    ]
+})
+
+_SLACK_APPROVAL = _slack_template({
+    "text": "{{fallback}}",
+    "blocks": [
+        {
+            "type": "header",
+            "text": {"type": "plain_text", "text": "🚨 Human Approval Required"}
+        },
+        {
+            "type": "section",
+            "text": {"type": "mrkdwn", "text": "{{summary}}"}
+        },
+        {
+            "type": "section",
+            "text": {"type": "mrkdwn", "text": "{{plan}}"}
+        },
+        {
+            "type": "actions",
+            "elements": [
+                {
+                    "type": "button",
+                    "text": {"type": "plain_text", "text": "✅ Review & Approve"},
+                    "url": "{{dashboard_url}}",
+                    "style": "danger"
+                }
+            ]
+        }
+    ]
+})
+
+
+async def _slack_incident_created(incident: dict[str, Any]) -> None:
     risk = incident.get("risk_score", 0)
     iid = incident.get("id") or incident.get("incident_id", "?")
     indicators = incident.get("found_indicators", [])
 
-    _send_slack({
-        "text": f"*⚠️ New Guardian Incident* — {_risk_label(risk)}",
-        "blocks": [
-            {
-                "type": "header",
-                "text": {"type": "plain_text", "text": f"⚠️ New Incident Detected — Risk {risk}/10"}
-            },
-            {
-                "type": "section",
-                "fields": [
-                    {"type": "mrkdwn", "text": f"*Incident ID:*\n`{iid[:8].upper()}`"},
-                    {"type": "mrkdwn", "text": f"*Risk Score:*\n{_risk_label(risk)} ({risk}/10)"},
-                    {"type": "mrkdwn", "text": f"*Source:*\n{incident.get('log_source', 'unknown')}"},
-                    {"type": "mrkdwn", "text": f"*Time:*\n{_now()}"},
-                ]
-            },
-            {
-                "type": "section",
-                "text": {"type": "mrkdwn", "text": f"*Indicators:*\n{', '.join(indicators) if indicators else 'None yet'}"}
-            },
-            {
-                "type": "actions",
-                "elements": [
-                    {
-                        "type": "button",
-                        "text": {"type": "plain_text", "text": "🔍 View Incident"},
-                        "url": f"{os.getenv('DASHBOARD_URL', 'http://localhost:3000')}",
-                        "style": "danger" if risk >= 7 else "primary"
-                    }
-                ]
-            }
-        ]
-    })
-
-
-def _slack_incident_complete(incident: dict[str, Any]) -> None:
+    await _send_slack(_SLACK_CREATED % _slots(
+        fallback=f"*⚠️ New Guardian Incident* — {_risk_label(risk)}",
+        header=f"⚠️ New Incident Detected — Risk {risk}/10",
+        incident_id=f"*Incident ID:*\n`{iid[:8].upper()}`",
+        risk=f"*Risk Score:*\n{_risk_label(risk)} ({risk}/10)",
+        source=f"*Source:*\n{incident.get('log_source', 'unknown')}",
+        time=f"*Time:*\n{_now()}",
+        indicators=f"*Indicators:*\n{', '.join(indicators) if indicators else 'None yet'}",
+        dashboard_url=CFG.dashboard_url,
+        style="danger" if risk >= 7 else "primary",
+    ))
+
+
+async def _slack_incident_complete(incident: dict[str, Any]) -> None:
     risk = incident.get("risk_score", 0)
     iid = incident.get("id") or incident.get("incident_id", "?")
     actions = incident.get("executed_actions", [])
 
-    _send_slack({
-        "text": f"*✅ Guardian Incident Complete* — {_risk_label(risk)}",
-        "blocks": [
-            {
-                "type": "header",
-                "text": {"type": "plain_text", "text": f"✅ Incident Resolved — {len(actions)} Actions Taken"}
-            },
-            {
-                "type": "section",
-                "fields": [
-                    {"type": "mrkdwn", "text": f"*Incident ID:*\n`{iid[:8].upper()}`"},
-                    {"type": "mrkdwn", "text": f"*Risk Score:*\n{_risk_label(risk)} ({risk}/10)"},
-                ]
-            },
-            {
-                "type": "section",
-                "text": {"type": "mrkdwn", "text": "*Actions Executed:*\n" + "\n".join(f"• {a}" for a in actions) if actions else "No actions taken"}
-            }
-        ]
-    })
-
-
-def _slack_approval_needed(incident: dict[str, Any]) -> None:
+    await _send_slack(_SLACK_COMPLETE % _slots(
+        fallback=f"*✅ Guardian Incident Complete* — {_risk_label(risk)}",
+        header=f"✅ Incident Resolved — {len(actions)} Actions Taken",
+        incident_id=f"*Incident ID:*\n`{iid[:8].upper()}`",
+        risk=f"*Risk Score:*\n{_risk_label(risk)} ({risk}/10)",
+        actions="*Actions Executed:*\n" + "\n".join(f"• {a}" for a in actions) if actions else "No actions taken",
+    ))
+
+
+async def _slack_approval_needed(incident: dict[str, Any]) -> None:
     risk = incident.get("risk_score", 0)
     iid = incident.get("id") or incident.get("incident_id", "?")
     plan = (incident.get("mitigation_plan") or "").split("__ACTIONS__")[0][:300]
 
-    _send_slack({
-        "text": f"🚨 *APPROVAL REQUIRED* — Risk {risk}/10 incident needs authorization",
-        "blocks": [
-            {
-                "type": "header",
-                "text": {"type": "plain_text", "text": "🚨 Human Approval Required"}
-            },
-            {
-                "type": "section",
-                "text": {"type": "mrkdwn", "text": f"Incident `{iid[:8].upper()}` has risk score *{risk}/10* and requires manual authorization before executing mitigation actions."}
-            },
-            {
-                "type": "section",
-                "text": {"type": "mrkdwn", "text": f"*Proposed Plan:*\n{plan}..."}
-            },
-            {
-                "type": "actions",
-                "elements": [
-                    {
-                        "type": "button",
-                        "text": {"type": "plain_text", "text": "✅ Review & Approve"},
-                        "url": f"{os.getenv('DASHBOARD_URL', 'http://localhost:3000')}",
-                        "style": "danger"
-                    }
-                ]
-            }
-        ]
-    })
+    await _send_slack(_SLACK_APPROVAL % _slots(
+        fallback=f"🚨 *APPROVAL REQUIRED* — Risk {risk}/10 incident needs authorization",
+        summary=f"Incident `{iid[:8].upper()}` has risk score *{risk}/10* and requires manual authorization before executing mitigation actions.",
+        plan=f"*Proposed Plan:*\n{plan}...",
+        dashboard_url=CFG.dashboard_url,
+    ))
 
 
 # ---------------------------------------------------------------------------
 # Email
 # ---------------------------------------------------------------------------
 
+_SMTP_KEEPALIVE_SECONDS = 30
+
+_smtp: smtplib.SMTP | None = None
+_smtp_lock = threading.Lock()
+_smtp_keepalive_started = False
+
+# Static headers serialised once; per message only Subject + body are encoded
+_EMAIL_STATIC_HEADERS = (
+    f"From: {CFG.email_from}\r\n"
+    f"To: {CFG.email_to}\r\n"
+    "MIME-Version: 1.0\r\n"
+    "Content-Type: text/html; charset=utf-8\r\n"
+    "Content-Transfer-Encoding: base64\r\n"
+).encode()
+
+
+def _smtp_connect() -> smtplib.SMTP:
+    server = smtplib.SMTP(CFG.smtp_host, CFG.smtp_port, timeout=30)
+    server.ehlo()
+    server.starttls()
+    server.login(CFG.smtp_user, CFG.smtp_pass)
+    return server
+
+
+def _smtp_close() -> None:
+    """Drop the pooled SMTP session (caller holds _smtp_lock)."""
+    global _smtp
+    if _smtp is not None:
+        try:
+            _smtp.quit()
+        except Exception:
+            pass
+        _smtp = None
+
+
+def _smtp_keepalive() -> None:
+    while True:
+        time.sleep(_SMTP_KEEPALIVE_SECONDS)
+        with _smtp_lock:
+            if _smtp is None:
+                continue
+            try:
+                _smtp.noop()
+            except Exception:
+                _smtp_close()
+
+
+# Domain for Message-ID — taken from the sender so make_msgid() skips its getfqdn() lookup
+_MSGID_DOMAIN = CFG.email_from.rpartition("@")[2].strip(" >") or "guardian.local"
+
+
+def _raw_email(subject: str, html_body: str) -> bytes:
+    # Long encoded subjects fold across lines; SMTP DATA needs CRLF, not bare LF
+    encoded_subject = Header(subject, "utf-8").encode(linesep="\r\n")
+    return (
+        _EMAIL_STATIC_HEADERS
+        + (
+            f"Date: {formatdate(usegmt=True)}\r\n"
+            f"Message-ID: {make_msgid(domain=_MSGID_DOMAIN)}\r\n"
+            f"Subject: {encoded_subject}\r\n\r\n"
+        ).encode()
+        + base64.encodebytes(html_body.encode()).replace(b"\n", b"\r\n")
+    )
+
+
 def _send_email(subject: str, html_body: str) -> bool:
-    if os.getenv("EMAIL_ENABLED", "").lower() not in ("true", "1"):
+    global _smtp, _smtp_keepalive_started
+    if not CFG.email_enabled:
         return False
 
-    smtp_host = os.getenv("EMAIL_SMTP_HOST", "smtp.gmail.com")
-    smtp_port = int(os.getenv("EMAIL_SMTP_PORT", "587"))
-    smtp_user = os.getenv("EMAIL_SMTP_USER", "")
-    smtp_pass = os.getenv("EMAIL_SMTP_PASS", "")
-    email_from = os.getenv("EMAIL_FROM", smtp_user)
-    email_to = os.getenv("EMAIL_TO", "")
-
-    if not all([smtp_user, smtp_pass, email_to]):
+    if not all([CFG.smtp_user, CFG.smtp_pass, CFG.email_to]):
         print("  ⚠️  [EMAIL] Missing config — set EMAIL_SMTP_USER, EMAIL_SMTP_PASS, EMAIL_TO")
         return False
 
+    raw = _raw_email(subject, html_body)
+    recipients = CFG.email_to.split(",")
     try:
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = subject
-        msg["From"] = email_from
-        msg["To"] = email_to
-        msg.attach(MIMEText(html_body, "html"))
-
-        with smtplib.SMTP(smtp_host, smtp_port) as server:
-            server.ehlo()
-            server.starttls()
-            server.login(smtp_user, smtp_pass)
-            server.sendmail(email_from, email_to.split(","), msg.as_string())
-
-        print(f"  📧 [EMAIL] Sent to {email_to}")
+        with _smtp_lock:
+            # Reuse the authenticated session; reconnect once if the server dropped it
+            for attempt in range(2):
+                if _smtp is None:
+                    _smtp = _smtp_connect()
+                try:
+                    _smtp.sendmail(CFG.email_from, recipients, raw)
+                    break
+                except smtplib.SMTPServerDisconnected:
+                    _smtp = None
+                    if attempt:
+                        raise
+            if not _smtp_keepalive_started:
+                threading.Thread(target=_smtp_keepalive, name="guardian-smtp-keepalive", daemon=True).start()
+                _smtp_keepalive_started = True
+
+        print(f"  📧 [EMAIL] Sent to {CFG.email_to}")
         return True
     except Exception as e:
         print(f"  ⚠️  [EMAIL] Failed: {e}")
+        with _smtp_lock:
+            _smtp_close()
         return False
 
 
-def _email_incident_created(incident: dict[str, Any]) -> None:
+async def _email_incident_created(incident: dict[str, Any]) -> None:
     risk = incident.get("risk_score", 0)
     iid = incident.get("id") or incident.get("incident_id", "?")
     indicators = incident.get("found_indicators", [])
@@ -232,16 +373,16 @@ def _email_incident_created(incident: dict[str, Any]) -> None:
             </tr>
         </table>
         <div style="margin-top: 24px; text-align: center;">
-            <a href="{os.getenv('DASHBOARD_URL', 'http://localhost:3000')}" style="background: {color}22; color: {color}; border: 1px solid {color}44; padding: 12px 24px; border-radius: 4px; text-decoration: none; font-weight: bold;">
+            <a href="{CFG.dashboard_url}" style="background: {color}22; color: {color}; border: 1px solid {color}44; padding: 12px 24px; border-radius: 4px; text-decoration: none; font-weight: bold;">
                 View in Guardian Dashboard →
             </a>
         </div>
     </div>
     """
-    _send_email(f"[Guardian] New Incident — Risk {risk}/10 ({_risk_label(risk)})", html)
+    await asyncio.to_thread(_send_email, f"[Guardian] New Incident — Risk {risk}/10 ({_risk_label(risk)})", html)
 
 
-def _email_approval_needed(incident: dict[str, Any]) -> None:
+async def _email_approval_needed(incident: dict[str, Any]) -> None:
     risk = incident.get("risk_score", 0)
     iid = incident.get("id") or incident.get("incident_id", "?")
 
@@ -256,36 +397,103 @@ def _email_approval_needed(incident: dict[str, Any]) -> None:
             These actions require your manual approval before execution.
         </p>
         <div style="margin-top: 24px; text-align: center;">
-            <a href="{os.getenv('DASHBOARD_URL', 'http://localhost:3000')}" style="background: #ff8c0022; color: #ff8c00; border: 1px solid #ff8c0044; padding: 14px 32px; border-radius: 4px; text-decoration: none; font-weight: bold; font-size: 16px;">
+            <a href="{CFG.dashboard_url}" style="background: #ff8c0022; color: #ff8c00; border: 1px solid #ff8c0044; padding: 14px 32px; border-radius: 4px; text-decoration: none; font-weight: bold; font-size: 16px;">
                 ✅ Review &amp; Approve Actions →
             </a>
         </div>
     </div>
     """
-    _send_email(f"[Guardian] 🚨 APPROVAL REQUIRED — Incident {iid[:8].upper()} Risk {risk}/10", html)
+    await asyncio.to_thread(_send_email, f"[Guardian] 🚨 APPROVAL REQUIRED — Incident {iid[:8].upper()} Risk {risk}/10", html)
 
 
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
+async def _send_incident_created(incident: dict[str, Any]) -> None:
+    jobs = []
+    if CFG.slack_enabled:
+        jobs.append(_slack_incident_created(incident))
+    if CFG.email_enabled:
+        jobs.append(_email_incident_created(incident))
+    await asyncio.gather(*jobs)
+
+
+async def _send_approval_needed(incident: dict[str, Any]) -> None:
+    jobs = []
+    if CFG.slack_enabled:
+        jobs.append(_slack_approval_needed(incident))
+    if CFG.email_enabled:
+        jobs.append(_email_approval_needed(incident))
+    await asyncio.gather(*jobs)
+
+
+async def _send_incident_complete(incident: dict[str, Any]) -> None:
+    if CFG.slack_enabled:
+        await _slack_incident_complete(incident)
+
+
+_SENDERS = {
+    "created": _send_incident_created,
+    "approval": _send_approval_needed,
+    "complete": _send_incident_complete,
+}
+
+_NOTIFY_COALESCE_SECONDS = 0.2
+_NOTIFY_Q: asyncio.Queue[tuple[str, dict[str, Any]]] = asyncio.Queue(maxsize=1024)
+_notify_worker_task: asyncio.Task | None = None
+
+
+def _enqueue(kind: str, incident: dict[str, Any]) -> None:
+    try:
+        _NOTIFY_Q.put_nowait((kind, incident))
+    except asyncio.QueueFull:
+        print(f"  ⚠️  [NOTIFY] Queue full — dropping '{kind}' notification")
+
+
+async def _notify_worker() -> None:
+    while True:
+        batch = [await _NOTIFY_Q.get()]
+        # Let a burst accumulate, then send only the latest event per (kind, incident)
+        await asyncio.sleep(_NOTIFY_COALESCE_SECONDS)
+        while not _NOTIFY_Q.empty():
+            batch.append(_NOTIFY_Q.get_nowait())
+        latest: dict[tuple[str, str], dict[str, Any]] = {}
+        for kind, incident in batch:
+            key = (kind, incident.get("id") or incident.get("incident_id", "?"))
+            latest.pop(key, None)
+            latest[key] = incident
+        for (kind, _), incident in latest.items():
+            try:
+                await _SENDERS[kind](incident)
+            except Exception as e:
+                print(f"  ⚠️  [NOTIFY] '{kind}' failed: {e}")
+
+
+def start_notify_worker() -> None:
+    """Start draining the notification queue (call from app startup)."""
+    global _notify_worker_task
+    if _notify_worker_task is None:
+        _notify_worker_task = asyncio.create_task(_notify_worker())
+
+
+def stop_notify_worker() -> None:
+    global _notify_worker_task
+    if _notify_worker_task is not None:
+        _notify_worker_task.cancel()
+        _notify_worker_task = None
+
+
 def notify_incident_created(incident: dict[str, Any]) -> None:
-    """Call when a new incident is created."""
-    if os.getenv("SLACK_ENABLED", "").lower() in ("true", "1"):
-        _slack_incident_created(incident)
-    if os.getenv("EMAIL_ENABLED", "").lower() in ("true", "1"):
-        _email_incident_created(incident)
+    """Call when a new incident is created. Queues the notification and returns immediately."""
+    _enqueue("created", incident)
 
 
 def notify_approval_needed(incident: dict[str, Any]) -> None:
     """Call when HITL approval is needed (risk > 7)."""
-    if os.getenv("SLACK_ENABLED", "").lower() in ("true", "1"):
-        _slack_approval_needed(incident)
-    if os.getenv("EMAIL_ENABLED", "").lower() in ("true", "1"):
-        _email_approval_needed(incident)
+    _enqueue("approval", incident)
 
 
 def notify_incident_complete(incident: dict[str, Any]) -> None:
     """Call when an incident completes."""
-    if os.getenv("SLACK_ENABLED", "").lower() in ("true", "1"):
-        _slack_incident_complete(incident)
\ No newline at end of file
+    _enqueue("complete", incident)
@@ -6,23 +6,40 @@ Generates a professional incident report PDF using reportlab.
 Usage:
     from app.reports.generator import generate_incident_pdf
     pdf_bytes = generate_incident_pdf(incident_dict)
+    generate_incident_pdf(incident_dict, out=fileobj)   # stream into a file-like instead
+    pdf_bytes = await generate_incident_pdf_async(incident_dict)  # build in a worker process
+
+Rendered reports are cached on disk under $GUARDIAN_STATE_DIR/pdfcache, keyed
+by a hash of the incident, so repeat downloads of an unchanged incident skip
+the build.
 
 Install:
     pip install reportlab
 """
 
 from __future__ import annotations
+import asyncio
+import hashlib
 import io
+import multiprocessing
 import os
+import re
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, BinaryIO
+from xml.sax.saxutils import escape
 
+import orjson
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.units import cm
 from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
+    SimpleDocTemplate, Paragraph, Preformatted, Spacer, Table, LongTable, TableStyle,
     HRFlowable, KeepTogether
 )
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
@@ -61,8 +78,29 @@ def _risk_label(score: int) -> str:
     return "LOW"
 
 
-def _now() -> str:
-    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+def _report_time(incident: dict[str, Any]) -> str:
+    """The report's "Generated" stamp, taken from the incident so cached renders stay truthful."""
+    stamp = incident.get("completed_at") or incident.get("started_at")
+    if not stamp:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+    try:
+        return datetime.fromisoformat(stamp).astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+    except (TypeError, ValueError):
+        return str(stamp)
+
+
+_IPV4_RE = re.compile(r"^\d+(\.\d+){3}$")
+_HEX = frozenset("0123456789abcdef")
+
+
+def _ioc_type(ind: str) -> str:
+    if _IPV4_RE.match(ind):
+        return "IP Address"
+    if len(ind) in (32, 40, 64) and set(ind.lower()) <= _HEX:
+        return "File Hash"
+    if "http" in ind or "/" in ind:
+        return "URL/Domain"
+    return "Identifier"
 
 
 # ---------------------------------------------------------------------------
@@ -70,7 +108,6 @@ def _now() -> str:
 # ---------------------------------------------------------------------------
 
 def _build_styles():
-    base = getSampleStyleSheet()
     styles = {
         "title": ParagraphStyle(
             "GuardianTitle",
@@ -129,44 +166,141 @@ def _build_styles():
     return styles
 
 
+_STYLES: dict[str, ParagraphStyle] | None = None
+_styles_lock = threading.Lock()
+
+
+def _get_styles() -> dict[str, ParagraphStyle]:
+    """Stylesheet shared by every report — built once, on first use."""
+    global _STYLES
+    if _STYLES is None:
+        with _styles_lock:
+            if _STYLES is None:
+                _STYLES = _build_styles()
+    return _STYLES
+
+
+# Fixed table styles, built once at import
+_SUMMARY_TSTYLE_BASE = TableStyle([
+    # Header row
+    ("BACKGROUND", (0, 0), (-1, 0), PANEL),
+    ("TEXTCOLOR", (0, 0), (-1, 0), CYAN),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("FONTSIZE", (0, 0), (-1, 0), 9),
+    # Data rows
+    ("BACKGROUND", (0, 1), (-1, -1), BG_DARK),
+    ("TEXTCOLOR", (0, 1), (0, -1), TEXT_DIM),
+    ("FONTNAME", (0, 1), (0, -1), "Helvetica-Bold"),
+    ("FONTSIZE", (0, 1), (-1, -1), 9),
+    ("TEXTCOLOR", (1, 1), (1, -1), TEXT_MAIN),
+    # Risk score row
+    ("FONTNAME", (1, 3), (1, 3), "Helvetica-Bold"),
+    # Grid
+    ("GRID", (0, 0), (-1, -1), 0.5, BORDER),
+    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [BG_DARK, PANEL]),
+    ("PADDING", (0, 0), (-1, -1), 6),
+    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+])
+
+# One finished summary style per risk color (risk score row highlight)
+_SUMMARY_TSTYLES = {
+    _risk_label(score): TableStyle((("TEXTCOLOR", (1, 3), (1, 3), _risk_color(score)),),
+                                   parent=_SUMMARY_TSTYLE_BASE)
+    for score in (9, 7, 4, 0)
+}
+
+_IOC_TSTYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), PANEL),
+    ("TEXTCOLOR", (0, 0), (-1, 0), CYAN),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("FONTSIZE", (0, 0), (-1, -1), 8),
+    ("FONTNAME", (0, 1), (0, -1), "Courier"),
+    ("TEXTCOLOR", (0, 1), (-1, -1), TEXT_MAIN),
+    ("GRID", (0, 0), (-1, -1), 0.5, BORDER),
+    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [BG_DARK, PANEL]),
+    ("PADDING", (0, 0), (-1, -1), 5),
+])
+
+_ACT_TSTYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), PANEL),
+    ("TEXTCOLOR", (0, 0), (-1, 0), CYAN),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("FONTSIZE", (0, 0), (-1, -1), 8),
+    ("FONTNAME", (0, 1), (1, -1), "Courier"),
+    ("TEXTCOLOR", (0, 1), (-1, -1), TEXT_MAIN),
+    ("TEXTCOLOR", (2, 1), (2, -1), GREEN),
+    ("GRID", (0, 0), (-1, -1), 0.5, BORDER),
+    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [BG_DARK, PANEL]),
+    ("PADDING", (0, 0), (-1, -1), 5),
+    ("ALIGN", (0, 0), (0, -1), "CENTER"),
+])
+
+
 # ---------------------------------------------------------------------------
 # Page template (header/footer on every page)
 # ---------------------------------------------------------------------------
 
-def _add_page_decorations(canvas, doc):
-    canvas.saveState()
+_RAW_LOG_LINE_CHARS = 100  # Courier 8pt across the usable A4 width
+
+# Fixed row heights (font leading + top/bottom PADDING) so Table skips its
+# per-cell height measurement; all these cells are single-line strings
+_SUMMARY_ROW_H = 0.8*cm  # 9pt, padding 6
+_LIST_ROW_H    = 0.7*cm  # 8pt, padding 5
+
+_LOGO_FONT   = ("Helvetica-Bold", 11)
+_HEADER_FONT = ("Helvetica", 8)
+_FOOTER_FONT = ("Helvetica", 7)
+
+
+_CHROME_FORM = "guardian_chrome"
+
+
+def _draw_chrome(canvas, generated: str):
+    """Everything on the page frame except the page number — identical on every page."""
     w, h = A4
 
-    # Top bar
+    # Drawn grouped by fill color so each color is set once
+
+    # Top + bottom bars
     canvas.setFillColor(PANEL)
     canvas.rect(0, h - 1.2*cm, w, 1.2*cm, fill=1, stroke=0)
+    canvas.rect(0, 0, w, 0.9*cm, fill=1, stroke=0)
 
-    # Top bar accent line
-    canvas.setFillColor(CYAN)
-    canvas.rect(0, h - 1.2*cm, w, 2, fill=1, stroke=0)
+    # Bottom bar border line
+    canvas.setFillColor(BORDER)
+    canvas.rect(0, 0.9*cm, w, 1, fill=1, stroke=0)
 
-    # Logo text
+    # Top bar accent line + logo text
     canvas.setFillColor(CYAN)
-    canvas.setFont("Helvetica-Bold", 11)
+    canvas.rect(0, h - 1.2*cm, w, 2, fill=1, stroke=0)
+    canvas.setFont(*_LOGO_FONT)
     canvas.drawString(1.5*cm, h - 0.85*cm, "GUARDIAN AGENT")
+
+    # Tagline + footer text
     canvas.setFillColor(TEXT_DIM)
-    canvas.setFont("Helvetica", 8)
+    canvas.setFont(*_HEADER_FONT)
     canvas.drawString(1.5*cm, h - 1.05*cm, "Autonomous Threat Hunter & Incident Responder")
+    canvas.setFont(*_FOOTER_FONT)
+    canvas.drawString(1.5*cm, 0.3*cm, f"Generated: {generated}")
+    canvas.drawRightString(w - 1.5*cm, 0.3*cm, "CONFIDENTIAL — FOR AUTHORIZED USE ONLY")
 
-    # Page number top right
-    canvas.setFillColor(TEXT_DIM)
-    canvas.setFont("Helvetica", 8)
-    canvas.drawRightString(w - 1.5*cm, h - 0.75*cm, f"Page {doc.page}")
 
-    # Bottom bar
-    canvas.setFillColor(PANEL)
-    canvas.rect(0, 0, w, 0.9*cm, fill=1, stroke=0)
-    canvas.setFillColor(BORDER)
-    canvas.rect(0, 0.9*cm, w, 1, fill=1, stroke=0)
+def _add_page_decorations(canvas, doc):
+    # The static chrome is recorded once per document as a Form XObject;
+    # later pages only reference it
+    if not getattr(doc, "_guardian_chrome", False):
+        canvas.beginForm(_CHROME_FORM)
+        _draw_chrome(canvas, doc._guardian_now)
+        canvas.endForm()
+        doc._guardian_chrome = True
+
+    canvas.saveState()
+    canvas.doForm(_CHROME_FORM)
+
+    # Page number top right
     canvas.setFillColor(TEXT_DIM)
-    canvas.setFont("Helvetica", 7)
-    canvas.drawString(1.5*cm, 0.3*cm, f"Generated: {_now()}")
-    canvas.drawRightString(w - 1.5*cm, 0.3*cm, "CONFIDENTIAL — FOR AUTHORIZED USE ONLY")
+    canvas.setFont(*_HEADER_FONT)
+    canvas.drawRightString(A4[0] - 1.5*cm, A4[1] - 0.75*cm, f"Page {doc.page}")
 
     canvas.restoreState()
 
@@ -175,25 +309,92 @@ def _add_page_decorations(canvas, doc):
 # Main generator
 # ---------------------------------------------------------------------------
 
-def generate_incident_pdf(incident: dict[str, Any]) -> bytes:
-    """Generate a PDF report for an incident. Returns raw bytes."""
-    buffer = io.BytesIO()
+_PDF_CACHE_DIR = Path(os.getenv("GUARDIAN_STATE_DIR", "/tmp")) / "pdfcache"
+_PDF_CACHE_MAX = 256  # files; least recently used are evicted beyond this
+_PDF_LAYOUT_VERSION = b"2"  # bump whenever the rendered output changes, or stale PDFs are served
+
+
+def _cache_key(incident: dict[str, Any]) -> str | None:
+    try:
+        blob = orjson.dumps(incident, option=orjson.OPT_SORT_KEYS)
+    except TypeError:
+        return None
+    return hashlib.blake2b(_PDF_LAYOUT_VERSION + b":" + blob, digest_size=16).hexdigest()
+
+
+def _evict_pdf_cache() -> None:
+    try:
+        with os.scandir(_PDF_CACHE_DIR) as it:
+            files = [(e.stat().st_mtime, e.path) for e in it if e.name.endswith(".pdf")]
+    except OSError:
+        return
+    if len(files) <= _PDF_CACHE_MAX:
+        return
+    files.sort()
+    for _, path in files[:len(files) - _PDF_CACHE_MAX]:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def generate_incident_pdf(incident: dict[str, Any], out: BinaryIO | None = None) -> bytes | None:
+    """
+    Generate a PDF report for an incident.
+    Writes into `out` (any binary file-like) and returns None, or returns raw bytes if no `out` is given.
+    """
+    if out is None:
+        buffer = io.BytesIO()
+        generate_incident_pdf(incident, buffer)
+        return buffer.getvalue()
+
+    key = _cache_key(incident)
+    if key is None:
+        _build_pdf(incident, out)
+        return None
+
+    cached = _PDF_CACHE_DIR / f"{key}.pdf"
+    try:
+        with cached.open("rb") as fh:
+            shutil.copyfileobj(fh, out)
+        os.utime(cached)  # mtime doubles as the LRU clock
+        return None
+    except FileNotFoundError:
+        pass
+
+    _PDF_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=_PDF_CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w+b") as fh:
+            _build_pdf(incident, fh)
+            fh.seek(0)
+            shutil.copyfileobj(fh, out)
+        os.replace(tmp, cached)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    _evict_pdf_cache()
+    return None
+
+
+def _build_pdf(incident: dict[str, Any], out: BinaryIO) -> None:
     doc = SimpleDocTemplate(
-        buffer,
+        out,
         pagesize=A4,
         leftMargin=1.5*cm,
         rightMargin=1.5*cm,
         topMargin=1.8*cm,
         bottomMargin=1.5*cm,
     )
+    # One timestamp per document — shared by the title block and every footer
+    doc._guardian_now = generated = _report_time(incident)
 
-    S = _build_styles()
+    S = _get_styles()
     story = []
     w = A4[0] - 3*cm  # usable width
 
     iid = incident.get("id") or incident.get("incident_id", "UNKNOWN")
     risk = incident.get("risk_score", 0)
-    risk_color = _risk_color(risk)
     status = incident.get("status", "unknown").upper()
     indicators = incident.get("found_indicators", [])
     ti_results = incident.get("investigation_results", [])
@@ -203,7 +404,7 @@ def generate_incident_pdf(incident: dict[str, Any]) -> bytes:
     # ---- Title block -------------------------------------------------------
     story.append(Spacer(1, 0.5*cm))
     story.append(Paragraph("INCIDENT REPORT", S["title"]))
-    story.append(Paragraph(f"Generated {_now()}", S["subtitle"]))
+    story.append(Paragraph(f"Generated {generated}", S["subtitle"]))
     story.append(HRFlowable(width=w, color=BORDER, thickness=1))
     story.append(Spacer(1, 0.3*cm))
 
@@ -222,28 +423,9 @@ def generate_incident_pdf(incident: dict[str, Any]) -> bytes:
         ["Approval Decision", incident.get("approval_decision", "—").upper()],
     ]
 
-    summary_table = Table(summary_data, colWidths=[4*cm, w - 4*cm])
-    summary_table.setStyle(TableStyle([
-        # Header row
-        ("BACKGROUND", (0, 0), (-1, 0), PANEL),
-        ("TEXTCOLOR", (0, 0), (-1, 0), CYAN),
-        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-        ("FONTSIZE", (0, 0), (-1, 0), 9),
-        # Data rows
-        ("BACKGROUND", (0, 1), (-1, -1), BG_DARK),
-        ("TEXTCOLOR", (0, 1), (0, -1), TEXT_DIM),
-        ("FONTNAME", (0, 1), (0, -1), "Helvetica-Bold"),
-        ("FONTSIZE", (0, 1), (-1, -1), 9),
-        ("TEXTCOLOR", (1, 1), (1, -1), TEXT_MAIN),
-        # Risk score row highlight
-        ("TEXTCOLOR", (1, 3), (1, 3), risk_color),
-        ("FONTNAME", (1, 3), (1, 3), "Helvetica-Bold"),
-        # Grid
-        ("GRID", (0, 0), (-1, -1), 0.5, BORDER),
-        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [BG_DARK, PANEL]),
-        ("PADDING", (0, 0), (-1, -1), 6),
-        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-    ]))
+    summary_table = Table(summary_data, colWidths=[4*cm, w - 4*cm],
+                          rowHeights=[_SUMMARY_ROW_H] * len(summary_data))
+    summary_table.setStyle(_SUMMARY_TSTYLES[_risk_label(risk)])
     story.append(summary_table)
     story.append(Spacer(1, 0.4*cm))
 
@@ -251,27 +433,18 @@ def generate_incident_pdf(incident: dict[str, Any]) -> bytes:
     story.append(Paragraph("INDICATORS OF COMPROMISE (IOCs)", S["section"]))
     if indicators:
         ioc_data = [["Indicator", "Type", "Verdict", "Details"]]
+        ti_by_ind = {r.get("indicator"): r for r in ti_results if r.get("indicator")}
         for ind in indicators:
-            ti = next((r for r in ti_results if r.get("indicator") == ind), {})
+            ti = ti_by_ind.get(ind, {})
             verdict = "🔴 MALICIOUS" if ti.get("is_malicious") else ("🟢 CLEAN" if ti else "⚪ UNKNOWN")
-            itype = "IP Address" if "." in ind and ind.replace(".", "").isdigit() else \
-                    "File Hash" if len(ind) in (32, 40, 64) and all(c in "0123456789abcdef" for c in ind.lower()) else \
-                    "URL/Domain" if "http" in ind or "/" in ind else "Identifier"
+            itype = _ioc_type(ind)
             detail = ti.get("abuse_score") or ti.get("detection_ratio") or "—"
             ioc_data.append([ind[:40], itype, verdict, str(detail)])
 
-        ioc_table = Table(ioc_data, colWidths=[5.5*cm, 2.8*cm, 3*cm, w - 11.3*cm])
-        ioc_table.setStyle(TableStyle([
-            ("BACKGROUND", (0, 0), (-1, 0), PANEL),
-            ("TEXTCOLOR", (0, 0), (-1, 0), CYAN),
-            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-            ("FONTSIZE", (0, 0), (-1, -1), 8),
-            ("FONTNAME", (0, 1), (0, -1), "Courier"),
-            ("TEXTCOLOR", (0, 1), (-1, -1), TEXT_MAIN),
-            ("GRID", (0, 0), (-1, -1), 0.5, BORDER),
-            ("ROWBACKGROUNDS", (0, 1), (-1, -1), [BG_DARK, PANEL]),
-            ("PADDING", (0, 0), (-1, -1), 5),
-        ]))
+        # LongTable splits across pages without re-laying-out the remaining rows
+        ioc_table = LongTable(ioc_data, colWidths=[5.5*cm, 2.8*cm, 3*cm, w - 11.3*cm],
+                              rowHeights=[_LIST_ROW_H] * len(ioc_data), repeatRows=1)
+        ioc_table.setStyle(_IOC_TSTYLE)
         story.append(ioc_table)
     else:
         story.append(Paragraph("No indicators of compromise found.", S["body"]))
@@ -280,7 +453,8 @@ def generate_incident_pdf(incident: dict[str, Any]) -> bytes:
     # ---- Mitigation Plan ---------------------------------------------------
     story.append(Paragraph("MITIGATION PLAN", S["section"]))
     if plan_text:
-        story.append(Paragraph(plan_text, S["body"]))
+        # One pre-sized join keeps the plan's line breaks; escape so "<" / "&" aren't parsed as markup
+        story.append(Paragraph("<br/>".join(map(escape, plan_text.splitlines())), S["body"]))
     else:
         story.append(Paragraph("No mitigation plan available.", S["body"]))
     story.append(Spacer(1, 0.4*cm))
@@ -288,27 +462,15 @@ def generate_incident_pdf(incident: dict[str, Any]) -> bytes:
     # ---- Executed Actions --------------------------------------------------
     story.append(Paragraph("EXECUTED ACTIONS", S["section"]))
     if actions:
-        action_data = [["#", "Action", "Result"]]
+        action_data: list[Any] = [None] * (len(actions) + 1)
+        action_data[0] = ["#", "Action", "Result"]
         for i, act in enumerate(actions, 1):
-            parts = act.split(" → ")
-            action_str = parts[0] if parts else act
-            result_str = parts[1] if len(parts) > 1 else "—"
-            action_data.append([str(i), action_str, result_str])
-
-        act_table = Table(action_data, colWidths=[1*cm, w - 4*cm, 3*cm])
-        act_table.setStyle(TableStyle([
-            ("BACKGROUND", (0, 0), (-1, 0), PANEL),
-            ("TEXTCOLOR", (0, 0), (-1, 0), CYAN),
-            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-            ("FONTSIZE", (0, 0), (-1, -1), 8),
-            ("FONTNAME", (0, 1), (1, -1), "Courier"),
-            ("TEXTCOLOR", (0, 1), (-1, -1), TEXT_MAIN),
-            ("TEXTCOLOR", (2, 1), (2, -1), GREEN),
-            ("GRID", (0, 0), (-1, -1), 0.5, BORDER),
-            ("ROWBACKGROUNDS", (0, 1), (-1, -1), [BG_DARK, PANEL]),
-            ("PADDING", (0, 0), (-1, -1), 5),
-            ("ALIGN", (0, 0), (0, -1), "CENTER"),
-        ]))
+            head, _, tail = act.partition(" → ")
+            action_data[i] = [str(i), head, tail or "—"]
+
+        act_table = LongTable(action_data, colWidths=[1*cm, w - 4*cm, 3*cm],
+                              rowHeights=[_LIST_ROW_H] * len(action_data), repeatRows=1)
+        act_table.setStyle(_ACT_TSTYLE)
         story.append(act_table)
     else:
         story.append(Paragraph("No actions were executed.", S["body"]))
@@ -320,8 +482,44 @@ def generate_incident_pdf(incident: dict[str, Any]) -> bytes:
     # Truncate very long logs
     if len(raw_log) > 1500:
         raw_log = raw_log[:1500] + "\n... [truncated]"
-    story.append(Paragraph(raw_log.replace("\n", "<br/>"), S["mono"]))
+    # Preformatted keeps newlines literally and skips Paragraph's markup parser
+    story.append(Preformatted(raw_log, S["mono"], maxLineLength=_RAW_LOG_LINE_CHARS))
 
     # Build PDF
     doc.build(story, onFirstPage=_add_page_decorations, onLaterPages=_add_page_decorations)
-    return buffer.getvalue()
\ No newline at end of file
+
+
+# ---------------------------------------------------------------------------
+# Process pool (ReportLab holds the GIL for the whole build)
+# ---------------------------------------------------------------------------
+
+_PDF_POOL: ProcessPoolExecutor | None = None
+_pdf_pool_lock = threading.Lock()
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    """Created on first use so importing this module never spawns workers."""
+    global _PDF_POOL
+    if _PDF_POOL is None:
+        with _pdf_pool_lock:
+            if _PDF_POOL is None:
+                # spawn, not fork — the server process has live threads and an event loop
+                _PDF_POOL = ProcessPoolExecutor(
+                    max_workers=os.cpu_count(),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _PDF_POOL
+
+
+async def generate_incident_pdf_async(incident: dict[str, Any]) -> bytes:
+    """Build the report in a worker process so concurrent exports use every core."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_pdf_pool(), generate_incident_pdf, incident)
+
+
+def shutdown_pdf_pool() -> None:
+    global _PDF_POOL
+    with _pdf_pool_lock:
+        if _PDF_POOL is not None:
+            _PDF_POOL.shutdown(wait=False, cancel_futures=True)
+            _PDF_POOL = None
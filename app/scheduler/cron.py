@@ -19,22 +19,36 @@ Usage:
 """
 
 from __future__ import annotations
+import asyncio
 import os
 import hashlib
 import json
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import httpx
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.interval import IntervalTrigger
+
+if TYPE_CHECKING:
+    from apscheduler.schedulers.background import BackgroundScheduler
 
 _scheduler: BackgroundScheduler | None = None
-_submitted_hashes: set[str] = set()
-_STATE_FILE = Path(os.getenv("GUARDIAN_STATE_DIR", "/tmp")) / "guardian_scheduler_state.json"
+_submitted_hashes: set[bytes] = set()
+
+# Append-only log of raw 16-byte MD5 digests of each submitted file's bytes
+_STATE_DIR = Path(os.getenv("GUARDIAN_STATE_DIR", "/tmp"))
+_STATE_FILE = _STATE_DIR / "guardian_scheduler_state.bin"
+_LEGACY_STATE_FILE = _STATE_DIR / "guardian_scheduler_state.json"
+_DIGEST_SIZE = 16
+_FSYNC_EVERY = 32
+
+_state_fh = None
+_state_lock = threading.Lock()
+_unsynced = 0
 
 WATCH_EXTENSIONS = {".log", ".txt", ".json", ".syslog"}
+_EXT_NO_DOT = frozenset(ext[1:] for ext in WATCH_EXTENSIONS)
 API_BASE = os.getenv("GUARDIAN_API_URL", "http://localhost:8000")
 
 
@@ -45,28 +59,84 @@ def _now() -> str:
 def _load_state() -> None:
     """Load previously submitted hashes so we don't resubmit on restart."""
     global _submitted_hashes
-    if _STATE_FILE.exists():
-        try:
-            data = json.loads(_STATE_FILE.read_text())
-            _submitted_hashes = set(data.get("submitted_hashes", []))
-        except Exception:
-            pass
+    try:
+        data = _STATE_FILE.read_bytes()
+    except FileNotFoundError:
+        data = b""
+    except Exception:
+        return
+    # A torn trailing record from a crash mid-append is ignored
+    usable = len(data) - len(data) % _DIGEST_SIZE
+    _submitted_hashes = {data[i:i + _DIGEST_SIZE] for i in range(0, usable, _DIGEST_SIZE)}
+    _migrate_legacy_state()
+
+
+def _migrate_legacy_state() -> None:
+    """One-time import of the old JSON state file (hex digests) into the binary log."""
+    if not _LEGACY_STATE_FILE.exists():
+        return
+    try:
+        data = json.loads(_LEGACY_STATE_FILE.read_text())
+        legacy = {bytes.fromhex(h) for h in data.get("submitted_hashes", [])}
+        _save_state(*(legacy - _submitted_hashes))
+        _sync_state()
+        _LEGACY_STATE_FILE.unlink()
+    except Exception as e:
+        print(f"  ⚠️  [SCHEDULER] Could not migrate legacy state: {e}")
 
 
-def _save_state() -> None:
+def _save_state(*digests: bytes) -> None:
+    """Append digests to the state log — O(new) regardless of how many are stored."""
+    global _state_fh, _unsynced
+    if not digests:
+        return
+    _submitted_hashes.update(digests)
     try:
-        _STATE_FILE.write_text(json.dumps({"submitted_hashes": list(_submitted_hashes), "last_run": _now()}))
+        with _state_lock:
+            if _state_fh is None:
+                _state_fh = _STATE_FILE.open("ab")
+            _state_fh.write(b"".join(digests))
+            _state_fh.flush()
+            _unsynced += len(digests)
+            if _unsynced >= _FSYNC_EVERY:
+                os.fsync(_state_fh.fileno())
+                _unsynced = 0
     except Exception:
         pass
 
 
-def _submit_log(content: str, filename: str) -> dict[str, Any] | None:
+def _sync_state() -> None:
+    global _unsynced
+    with _state_lock:
+        if _state_fh is not None and _unsynced:
+            try:
+                os.fsync(_state_fh.fileno())
+            except OSError:
+                pass
+            _unsynced = 0
+
+
+def _close_state() -> None:
+    global _state_fh
+    _sync_state()
+    with _state_lock:
+        if _state_fh is not None:
+            _state_fh.close()
+            _state_fh = None
+
+
+_SUBMIT_CONCURRENCY = 8
+
+
+async def _submit_log(
+    client: httpx.AsyncClient, sem: asyncio.Semaphore, content: str, filename: str,
+) -> dict[str, Any] | None:
     try:
-        resp = httpx.post(
-            f"{API_BASE}/api/incidents",
-            json={"raw_log": content, "log_source": f"scheduler:{filename}"},
-            timeout=15.0,
-        )
+        async with sem:
+            resp = await client.post(
+                "/api/incidents",
+                json={"raw_log": content, "log_source": f"scheduler:{filename}"},
+            )
         resp.raise_for_status()
         return resp.json()
     except httpx.ConnectError:
@@ -77,47 +147,84 @@ def _submit_log(content: str, filename: str) -> dict[str, Any] | None:
         return None
 
 
-def scan_and_submit() -> None:
-    """Core scan job — runs on every tick."""
+def _is_watched(entry: os.DirEntry) -> bool:
+    stem, dot, ext = entry.name.rpartition(".")
+    return bool(dot and stem) and ext.lower() in _EXT_NO_DOT and entry.is_file()
+
+
+async def _scan_and_submit() -> None:
     log_dir = Path(os.getenv("SCHEDULER_LOG_DIR", "./scheduled_logs"))
     if not log_dir.exists():
         log_dir.mkdir(parents=True, exist_ok=True)
         return
 
     print(f"\n⏰ [SCHEDULER] Scanning {log_dir} at {_now()}")
-    found = 0
 
-    for file_path in sorted(log_dir.glob("*")):
-        if not file_path.is_file():
-            continue
-        if file_path.suffix.lower() not in WATCH_EXTENSIONS:
-            continue
+    pending: list[tuple[bytes, str, str]] = []
+    migrated: list[bytes] = []
+    seen: set[bytes] = set()
+    # DirEntry.is_file() answers from the readdir type — no second stat per file
+    with os.scandir(log_dir) as it:
+        entries = [e for e in it if _is_watched(e)]
+    entries.sort(key=lambda e: e.name)
 
+    for entry in entries:
+        file_path = Path(entry.path)
         try:
+            # Stream-hash the raw bytes; only decode files we haven't seen
+            with file_path.open("rb") as fh:
+                file_hash = hashlib.file_digest(fh, "md5").digest()  # noqa: S324
+            if file_hash in _submitted_hashes or file_hash in seen:
+                continue
+
             content = file_path.read_text(encoding="utf-8", errors="replace").strip()
             if not content:
                 continue
 
-            content_hash = hashlib.md5(content.encode()).hexdigest()  # noqa: S324
-            if content_hash in _submitted_hashes:
+            # State written before raw-byte hashing holds digests of the stripped
+            # text; adopt the file's raw digest instead of resubmitting it
+            seen.add(file_hash)
+            if hashlib.md5(content.encode()).digest() in _submitted_hashes:  # noqa: S324
+                migrated.append(file_hash)
                 continue
 
             print(f"  📄 New log: {file_path.name} ({len(content)} chars)")
-            result = _submit_log(content, file_path.name)
-            if result:
-                incident_id = result.get("incident_id", "?")
-                print(f"  ✅ Submitted → Incident {incident_id[:8].upper()}")
-                _submitted_hashes.add(content_hash)
-                _save_state()
-                found += 1
+            pending.append((file_hash, content, file_path.name))
 
         except Exception as e:
             print(f"  ⚠️  Error reading {file_path.name}: {e}")
 
-    if found == 0:
+    _save_state(*migrated)
+    if not pending:
         print(f"  ℹ️  No new logs found")
-    else:
-        print(f"  📊 Submitted {found} new log(s)")
+        return
+
+    # Fan the whole tick out over one pooled client instead of a connection per file
+    sem = asyncio.Semaphore(_SUBMIT_CONCURRENCY)
+    async with httpx.AsyncClient(
+        base_url=API_BASE,
+        timeout=15.0,
+        limits=httpx.Limits(max_connections=_SUBMIT_CONCURRENCY),
+    ) as client:
+        results = await asyncio.gather(
+            *(_submit_log(client, sem, content, name) for _, content, name in pending)
+        )
+
+    submitted: list[bytes] = []
+    for (content_hash, _, _), result in zip(pending, results):
+        if result:
+            incident_id = result.get("incident_id", "?")
+            print(f"  ✅ Submitted → Incident {incident_id[:8].upper()}")
+            submitted.append(content_hash)
+
+    # One state write per tick
+    _save_state(*submitted)
+    print(f"  📊 Submitted {len(submitted)} new log(s)")
+
+
+def scan_and_submit() -> None:
+    """Core scan job — runs on every tick (in a worker thread, so it owns its event loop)."""
+    asyncio.run(_scan_and_submit())
 
 
 def get_scheduler_status() -> dict[str, Any]:
@@ -153,6 +260,10 @@ def start_scheduler() -> None:
         print("  ℹ️  [SCHEDULER] Disabled (set SCHEDULER_ENABLED=true to enable)")
         return
 
+    # Only pay for APScheduler when the scheduler is actually enabled
+    from apscheduler.schedulers.background import BackgroundScheduler
+    from apscheduler.triggers.interval import IntervalTrigger
+
     _load_state()
     interval = int(os.getenv("SCHEDULER_INTERVAL_MINUTES", "60"))
 
@@ -164,16 +275,16 @@ def start_scheduler() -> None:
         name="Guardian Log Scanner",
         replace_existing=True,
         max_instances=1,
+        # Run immediately on startup — on the scheduler's thread, not the server's event loop
+        next_run_time=datetime.now(timezone.utc),
     )
     _scheduler.start()
     print(f"  ⏰ [SCHEDULER] Started — scanning every {interval} minute(s)")
 
-    # Run immediately on startup
-    scan_and_submit()
-
 
 def stop_scheduler() -> None:
     global _scheduler
     if _scheduler and _scheduler.running:
         _scheduler.shutdown(wait=False)
-        print("  ⏰ [SCHEDULER] Stopped")
\ No newline at end of file
+        print("  ⏰ [SCHEDULER] Stopped")
+    _close_state()
\ No newline at end of file
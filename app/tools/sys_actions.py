@@ -5,37 +5,159 @@ Includes:
   - block_ip_firewall        : JSON firewall rules (mock)
   - block_file_hash          : JSON endpoint blocklist (mock)
   - disable_user_account     : Okta OR Azure AD (real APIs) with JSON fallback
+  - disable_user_accounts    : batched disable_user_account, users run concurrently
   - isolate_host             : JSON quarantine registry (mock)
   - send_alert               : JSON alert log (mock / webhook)
+
+Stores are written as append-only "<store>.jsonl" sidecars and compacted
+into the canonical JSON file every 10k entries.
 """
 
 from __future__ import annotations
-import json
+import asyncio
 import os
+import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
 import httpx
+import orjson
 from langchain_core.tools import tool
 
 
 _STATE_DIR = Path(os.getenv("GUARDIAN_STATE_DIR", "/tmp"))
 
+# Executor actions run concurrently; serialize read-modify-write per store file
+_store_locks: dict[str, threading.Lock] = {}
+_store_locks_guard = threading.Lock()
+
+
+def _store_lock(filename: str) -> threading.Lock:
+    with _store_locks_guard:
+        return _store_locks.setdefault(filename, threading.Lock())
+
+
+# Writes append one JSON line to "<store>.jsonl" instead of rewriting the whole
+# store; reads fold the sidecar into the canonical JSON. Each line is
+# {"field": ..., "entry": ...} (list append) or adds "key" (dict set).
+#
+# Compaction stamps the canonical JSON with the sidecar generation it folded in
+# and restarts the sidecar with a {"gen": n + 1} header line, so a crash between
+# the two steps can't replay entries that are already in the canonical file.
+_COMPACT_EVERY = 10_000
+_GEN_KEY = "_sidecar_gen"
+_sidecars: dict[str, Any] = {}
+_sidecar_lines: dict[str, int] = {}
+_sidecar_gens: dict[str, int] = {}
+
+
+def _sidecar_path(filename: str) -> Path:
+    return _STATE_DIR / f"{filename}l"
+
 
 def _load_store(filename: str) -> dict[str, Any]:
+    """Canonical JSON + sidecar replay. Caller must hold _store_lock(filename)."""
     path = _STATE_DIR / filename
-    if path.exists():
+    try:
+        store = orjson.loads(path.read_bytes())
+    except FileNotFoundError:
+        store = {}
+    except orjson.JSONDecodeError:
+        # Torn by a crash (pre-atomic writes could do this): keep it for recovery, carry on with the sidecar
+        os.replace(path, path.with_name(f"{filename}.corrupt"))
+        print(f"  ⚠️  [STORE] {filename} is corrupt — moved aside to {filename}.corrupt")
+        store = {}
+    folded = store.pop(_GEN_KEY, -1)
+
+    try:
+        lines = _sidecar_path(filename).read_bytes().splitlines()
+    except FileNotFoundError:
+        lines = []
+    if not lines:
+        _sidecar_lines[filename] = 0
+        _sidecar_gens[filename] = folded + 1
+        return store
+
+    gen = 0  # sidecars written before generations existed have no header
+    try:
+        head = orjson.loads(lines[0])
+    except orjson.JSONDecodeError:
+        head = None
+    if isinstance(head, dict) and "field" not in head:
+        gen = head.get("gen", 0)
+        lines = lines[1:]
+    if gen <= folded:
+        # Compaction was interrupted after the canonical write; finish it
+        _reset_sidecar(filename, folded + 1)
+        return store
+
+    for line in lines:
         try:
-            return json.loads(path.read_text())
-        except json.JSONDecodeError:
-            pass
-    return {}
+            rec = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            continue  # torn final line after a crash
+        if "key" in rec:
+            store.setdefault(rec["field"], {})[rec["key"]] = rec["entry"]
+        else:
+            store.setdefault(rec["field"], []).append(rec["entry"])
+    _sidecar_lines[filename] = len(lines)
+    _sidecar_gens[filename] = gen
+    return store
 
 
 def _save_store(filename: str, data: dict[str, Any]) -> None:
-    (_STATE_DIR / filename).write_text(json.dumps(data, indent=2))
+    """Replace the canonical JSON atomically — readers see the old or the new file, never half of one."""
+    fd, tmp = tempfile.mkstemp(dir=_STATE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, _STATE_DIR / filename)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _reset_sidecar(filename: str, gen: int) -> None:
+    fh = _sidecars.pop(filename, None)
+    if fh is not None:
+        fh.close()
+    _sidecar_path(filename).write_bytes(orjson.dumps({"gen": gen}) + b"\n")
+    _sidecar_lines[filename] = 0
+    _sidecar_gens[filename] = gen
+
+
+def _append_store(filename: str, field: str, entry: dict[str, Any], key: str | None = None) -> None:
+    """Record one store mutation in O(1). Caller must hold _store_lock(filename)."""
+    rec: dict[str, Any] = {"field": field, "entry": entry}
+    if key is not None:
+        rec["key"] = key
+
+    if filename not in _sidecar_lines:
+        _load_store(filename)  # first write since startup: pick up the existing line count + generation
+    fh = _sidecars.get(filename)
+    if fh is None:
+        fh = _sidecars[filename] = _sidecar_path(filename).open("ab", buffering=0)
+        if fh.tell() == 0:
+            fh.write(orjson.dumps({"gen": _sidecar_gens[filename]}) + b"\n")
+    fh.write(orjson.dumps(rec) + b"\n")
+
+    _sidecar_lines[filename] += 1
+    if _sidecar_lines[filename] >= _COMPACT_EVERY:
+        _compact_store(filename)
+
+
+def _compact_store(filename: str) -> None:
+    """Fold the sidecar into the canonical JSON, then start the next sidecar generation."""
+    store = _load_store(filename)
+    gen = _sidecar_gens[filename]
+    _save_store(filename, {**store, _GEN_KEY: gen})
+    _reset_sidecar(filename, gen + 1)
 
 
 def _now() -> str:
@@ -49,15 +171,14 @@ def _now() -> str:
 @tool
 def block_ip_firewall(ip_address: str, reason: str = "Threat detected by Guardian") -> dict[str, Any]:
     """Block an IP address in the Guardian firewall deny-list."""
-    store = _load_store("guardian_firewall.json")
-    rules = store.get("deny_rules", [])
-    existing = next((r for r in rules if r["ip"] == ip_address), None)
-    if existing:
-        return {"action": "block_ip", "status": "already_blocked", "ip": ip_address, "blocked_at": existing["blocked_at"]}
-    rule = {"ip": ip_address, "reason": reason, "blocked_at": _now(), "blocked_by": "guardian_agent"}
-    rules.append(rule)
-    store["deny_rules"] = rules
-    _save_store("guardian_firewall.json", store)
+    with _store_lock("guardian_firewall.json"):
+        store = _load_store("guardian_firewall.json")
+        rules = store.get("deny_rules", [])
+        existing = next((r for r in rules if r["ip"] == ip_address), None)
+        if existing:
+            return {"action": "block_ip", "status": "already_blocked", "ip": ip_address, "blocked_at": existing["blocked_at"]}
+        rule = {"ip": ip_address, "reason": reason, "blocked_at": _now(), "blocked_by": "guardian_agent"}
+        _append_store("guardian_firewall.json", "deny_rules", rule)
     print(f"  🔥 [FIREWALL] Blocked IP: {ip_address}")
     return {"action": "block_ip", "status": "success", "ip": ip_address, "blocked_at": rule["blocked_at"]}
 
@@ -69,15 +190,14 @@ def block_ip_firewall(ip_address: str, reason: str = "Threat detected by Guardia
 @tool
 def block_file_hash(file_hash: str, threat_name: str = "Unknown malware") -> dict[str, Any]:
     """Add a file hash to the endpoint security blocklist."""
-    store = _load_store("guardian_blocklist.json")
-    hashes = store.get("blocked_hashes", [])
-    existing = next((h for h in hashes if h["hash"] == file_hash), None)
-    if existing:
-        return {"action": "block_hash", "status": "already_blocked", "hash": file_hash}
-    entry = {"hash": file_hash, "threat_name": threat_name, "blocked_at": _now(), "blocked_by": "guardian_agent"}
-    hashes.append(entry)
-    store["blocked_hashes"] = hashes
-    _save_store("guardian_blocklist.json", store)
+    with _store_lock("guardian_blocklist.json"):
+        store = _load_store("guardian_blocklist.json")
+        hashes = store.get("blocked_hashes", [])
+        existing = next((h for h in hashes if h["hash"] == file_hash), None)
+        if existing:
+            return {"action": "block_hash", "status": "already_blocked", "hash": file_hash}
+        entry = {"hash": file_hash, "threat_name": threat_name, "blocked_at": _now(), "blocked_by": "guardian_agent"}
+        _append_store("guardian_blocklist.json", "blocked_hashes", entry)
     print(f"  🚫 [BLOCKLIST] Blocked hash: {file_hash[:16]}...")
     return {"action": "block_hash", "status": "success", "hash": file_hash, "blocked_at": entry["blocked_at"]}
 
@@ -86,160 +206,216 @@ def block_file_hash(file_hash: str, threat_name: str = "Unknown malware") -> dic
 # User disable — Okta / Azure AD / JSON fallback
 # ---------------------------------------------------------------------------
 
-def _disable_user_okta(username: str, reason: str) -> dict[str, Any]:
-    """Suspend a user in Okta via the Users API."""
-    okta_domain = os.getenv("OKTA_DOMAIN", "")
-    okta_token = os.getenv("OKTA_API_TOKEN", "")
+# A batch of disables shares one AsyncClient (one TLS connection) and runs
+# every user's search+suspend round-trips concurrently
+_UserRequest = tuple[str, str]  # (username, reason)
 
-    if not okta_domain or not okta_token:
-        return {}
+_azure_token_lock = threading.Lock()
+_azure_token: str = ""
+_azure_exp: float = 0.0
 
-    headers = {
-        "Authorization": f"SSWS {okta_token}",
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-    }
 
+async def _disable_one_okta(client: httpx.AsyncClient, username: str, reason: str) -> dict[str, Any]:
     try:
-        with httpx.Client(timeout=10.0) as client:
-            # Find user by login/email
-            search_resp = client.get(
-                f"https://{okta_domain}/api/v1/users",
-                headers=headers,
-                params={"search": f'profile.login eq "{username}" or profile.email eq "{username}"'},
-            )
-            search_resp.raise_for_status()
-            users = search_resp.json()
-            if not users:
-                return {"action": "disable_user", "status": "not_found", "username": username, "provider": "okta"}
-
-            user_id = users[0]["id"]
-            current_status = users[0].get("status", "UNKNOWN")
-
-            if current_status == "SUSPENDED":
-                return {"action": "disable_user", "status": "already_disabled", "username": username, "provider": "okta"}
-
-            # Suspend the user
-            suspend_resp = client.post(
-                f"https://{okta_domain}/api/v1/users/{user_id}/lifecycle/suspend",
-                headers=headers,
-            )
-            suspend_resp.raise_for_status()
-
-            print(f"  🔒 [OKTA] Suspended user: {username} (id={user_id})")
-            return {
-                "action": "disable_user",
-                "status": "success",
-                "username": username,
-                "user_id": user_id,
-                "provider": "okta",
-                "disabled_at": _now(),
-                "reason": reason,
-            }
+        # Find user by login/email
+        search_resp = await client.get(
+            "/api/v1/users",
+            params={"search": f'profile.login eq "{username}" or profile.email eq "{username}"'},
+        )
+        search_resp.raise_for_status()
+        users = search_resp.json()
+        if not users:
+            return {"action": "disable_user", "status": "not_found", "username": username, "provider": "okta"}
+
+        user_id = users[0]["id"]
+        current_status = users[0].get("status", "UNKNOWN")
+
+        if current_status == "SUSPENDED":
+            return {"action": "disable_user", "status": "already_disabled", "username": username, "provider": "okta"}
+
+        # Suspend the user
+        suspend_resp = await client.post(f"/api/v1/users/{user_id}/lifecycle/suspend")
+        suspend_resp.raise_for_status()
+
+        print(f"  🔒 [OKTA] Suspended user: {username} (id={user_id})")
+        return {
+            "action": "disable_user",
+            "status": "success",
+            "username": username,
+            "user_id": user_id,
+            "provider": "okta",
+            "disabled_at": _now(),
+            "reason": reason,
+        }
     except Exception as exc:
         return {"action": "disable_user", "status": "error", "username": username, "provider": "okta", "error": str(exc)}
 
 
-def _disable_user_azure_ad(username: str, reason: str) -> dict[str, Any]:
-    """Disable a user in Azure AD via Microsoft Graph API."""
+async def _disable_users_okta(requests: list[_UserRequest]) -> list[dict[str, Any]] | None:
+    """Suspend users in Okta via the Users API. None if Okta isn't configured."""
+    okta_domain = os.getenv("OKTA_DOMAIN", "")
+    okta_token = os.getenv("OKTA_API_TOKEN", "")
+
+    if not okta_domain or not okta_token:
+        return None
+
+    async with httpx.AsyncClient(
+        base_url=f"https://{okta_domain}",
+        headers={
+            "Authorization": f"SSWS {okta_token}",
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+        },
+        http2=True,
+        timeout=10.0,
+    ) as client:
+        return list(await asyncio.gather(*(_disable_one_okta(client, u, r) for u, r in requests)))
+
+
+async def _azure_access_token(client: httpx.AsyncClient, tenant_id: str, client_id: str, client_secret: str) -> str:
+    """Client-credentials token, reused until 60 s before it expires."""
+    global _azure_token, _azure_exp
+    with _azure_token_lock:
+        if _azure_token and time.time() < _azure_exp - 60:
+            return _azure_token
+    token_resp = await client.post(
+        f"https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token",
+        data={
+            "grant_type": "client_credentials",
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "scope": "https://graph.microsoft.com/.default",
+        },
+    )
+    token_resp.raise_for_status()
+    body = token_resp.json()
+    with _azure_token_lock:
+        _azure_token = body["access_token"]
+        _azure_exp = time.time() + int(body.get("expires_in", 3600))
+        return _azure_token
+
+
+async def _disable_one_azure(client: httpx.AsyncClient, headers: dict[str, str], username: str, reason: str) -> dict[str, Any]:
+    global _azure_exp
+    try:
+        # Find user
+        search_resp = await client.get(
+            f"https://graph.microsoft.com/v1.0/users",
+            headers=headers,
+            params={"$filter": f"userPrincipalName eq '{username}' or mail eq '{username}'"},
+        )
+        search_resp.raise_for_status()
+        users = search_resp.json().get("value", [])
+        if not users:
+            return {"action": "disable_user", "status": "not_found", "username": username, "provider": "azure_ad"}
+
+        user_id = users[0]["id"]
+
+        # Disable account
+        patch_resp = await client.patch(
+            f"https://graph.microsoft.com/v1.0/users/{user_id}",
+            headers=headers,
+            json={"accountEnabled": False},
+        )
+        patch_resp.raise_for_status()
+
+        print(f"  🔒 [AZURE AD] Disabled user: {username} (id={user_id})")
+        return {
+            "action": "disable_user",
+            "status": "success",
+            "username": username,
+            "user_id": user_id,
+            "provider": "azure_ad",
+            "disabled_at": _now(),
+            "reason": reason,
+        }
+    except Exception as exc:
+        # A revoked token would otherwise keep failing until its cached expiry
+        if isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code == 401:
+            _azure_exp = 0.0
+        return {"action": "disable_user", "status": "error", "username": username, "provider": "azure_ad", "error": str(exc)}
+
+
+async def _disable_users_azure_ad(requests: list[_UserRequest]) -> list[dict[str, Any]] | None:
+    """Disable users in Azure AD via Microsoft Graph API. None if Azure isn't configured."""
     tenant_id = os.getenv("AZURE_TENANT_ID", "")
     client_id = os.getenv("AZURE_CLIENT_ID", "")
     client_secret = os.getenv("AZURE_CLIENT_SECRET", "")
 
     if not all([tenant_id, client_id, client_secret]):
-        return {}
+        return None
 
-    try:
-        with httpx.Client(timeout=15.0) as client:
-            # Get access token
-            token_resp = client.post(
-                f"https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token",
-                data={
-                    "grant_type": "client_credentials",
-                    "client_id": client_id,
-                    "client_secret": client_secret,
-                    "scope": "https://graph.microsoft.com/.default",
-                },
-            )
-            token_resp.raise_for_status()
-            access_token = token_resp.json()["access_token"]
-
-            headers = {
-                "Authorization": f"Bearer {access_token}",
-                "Content-Type": "application/json",
-            }
-
-            # Find user
-            search_resp = client.get(
-                f"https://graph.microsoft.com/v1.0/users",
-                headers=headers,
-                params={"$filter": f"userPrincipalName eq '{username}' or mail eq '{username}'"},
-            )
-            search_resp.raise_for_status()
-            users = search_resp.json().get("value", [])
-            if not users:
-                return {"action": "disable_user", "status": "not_found", "username": username, "provider": "azure_ad"}
-
-            user_id = users[0]["id"]
-
-            # Disable account
-            patch_resp = client.patch(
-                f"https://graph.microsoft.com/v1.0/users/{user_id}",
-                headers=headers,
-                json={"accountEnabled": False},
-            )
-            patch_resp.raise_for_status()
-
-            print(f"  🔒 [AZURE AD] Disabled user: {username} (id={user_id})")
-            return {
-                "action": "disable_user",
-                "status": "success",
-                "username": username,
-                "user_id": user_id,
-                "provider": "azure_ad",
-                "disabled_at": _now(),
-                "reason": reason,
-            }
-    except Exception as exc:
-        return {"action": "disable_user", "status": "error", "username": username, "provider": "azure_ad", "error": str(exc)}
+    async with httpx.AsyncClient(http2=True, timeout=15.0) as client:
+        try:
+            access_token = await _azure_access_token(client, tenant_id, client_id, client_secret)
+        except Exception as exc:
+            return [{"action": "disable_user", "status": "error", "username": u, "provider": "azure_ad", "error": str(exc)}
+                    for u, _ in requests]
+
+        headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json",
+        }
+        return list(await asyncio.gather(*(_disable_one_azure(client, headers, u, r) for u, r in requests)))
 
 
 def _disable_user_local(username: str, reason: str) -> dict[str, Any]:
     """Fallback: persist disable to local JSON store."""
-    store = _load_store("guardian_directory.json")
-    users = store.get("users", {})
-    users[username] = {
-        "status": "DISABLED",
-        "reason": reason,
-        "disabled_at": _now(),
-        "disabled_by": "guardian_agent",
-        "previous_status": users.get(username, {}).get("status", "ACTIVE"),
-        "provider": "local_mock",
-    }
-    store["users"] = users
-    _save_store("guardian_directory.json", store)
+    with _store_lock("guardian_directory.json"):
+        store = _load_store("guardian_directory.json")
+        users = store.get("users", {})
+        entry = {
+            "status": "DISABLED",
+            "reason": reason,
+            "disabled_at": _now(),
+            "disabled_by": "guardian_agent",
+            "previous_status": users.get(username, {}).get("status", "ACTIVE"),
+            "provider": "local_mock",
+        }
+        _append_store("guardian_directory.json", "users", entry, key=username)
     print(f"  🔒 [DIRECTORY] Disabled user: {username} (local mock)")
-    return {"action": "disable_user", "status": "success", "username": username, "provider": "local_mock", "disabled_at": users[username]["disabled_at"]}
+    return {"action": "disable_user", "status": "success", "username": username, "provider": "local_mock", "disabled_at": entry["disabled_at"]}
+
+
+async def disable_users_async(requests: list[_UserRequest]) -> list[dict[str, Any]]:
+    """
+    Disable a batch of (username, reason) pairs concurrently, results in input order.
+    Tries Okta first, then Azure AD, then falls back to local JSON.
+    """
+    if not requests:
+        return []
+
+    # Try Okta
+    results = await _disable_users_okta(requests)
+    if results is not None:
+        return results
+
+    # Try Azure AD
+    results = await _disable_users_azure_ad(requests)
+    if results is not None:
+        return results
+
+    # Fallback to local mock — store lock + file I/O, so keep it off the event loop
+    return await asyncio.to_thread(_disable_users_local, requests)
+
+
+def _disable_users_local(requests: list[_UserRequest]) -> list[dict[str, Any]]:
+    return [_disable_user_local(u, r) for u, r in requests]
 
 
 @tool
-def disable_user_account(username: str, reason: str = "Suspicious activity detected") -> dict[str, Any]:
+async def disable_user_account(username: str, reason: str = "Suspicious activity detected") -> dict[str, Any]:
     """
     Disable a user account. Tries Okta first, then Azure AD, then falls back to local JSON.
     Configure via OKTA_DOMAIN+OKTA_API_TOKEN or AZURE_TENANT_ID+AZURE_CLIENT_ID+AZURE_CLIENT_SECRET.
     """
-    # Try Okta
-    result = _disable_user_okta(username, reason)
-    if result:
-        return result
+    return (await disable_users_async([(username, reason)]))[0]
 
-    # Try Azure AD
-    result = _disable_user_azure_ad(username, reason)
-    if result:
-        return result
 
-    # Fallback to local mock
-    return _disable_user_local(username, reason)
+@tool
+async def disable_user_accounts(usernames: list[str], reason: str = "Suspicious activity detected") -> list[dict[str, Any]]:
+    """Disable several user accounts concurrently over one connection per provider."""
+    return await disable_users_async([(u, reason) for u in usernames])
 
 
 # ---------------------------------------------------------------------------
@@ -249,15 +425,14 @@ def disable_user_account(username: str, reason: str = "Suspicious activity detec
 @tool
 def isolate_host(hostname: str, reason: str = "Potential compromise") -> dict[str, Any]:
     """Mark a host for network isolation (quarantine VLAN)."""
-    store = _load_store("guardian_isolation.json")
-    hosts = store.get("isolated_hosts", [])
-    existing = next((h for h in hosts if h["hostname"] == hostname), None)
-    if existing:
-        return {"action": "isolate_host", "status": "already_isolated", "hostname": hostname}
-    entry = {"hostname": hostname, "reason": reason, "isolated_at": _now(), "isolated_by": "guardian_agent", "vlan": "QUARANTINE-999"}
-    hosts.append(entry)
-    store["isolated_hosts"] = hosts
-    _save_store("guardian_isolation.json", store)
+    with _store_lock("guardian_isolation.json"):
+        store = _load_store("guardian_isolation.json")
+        hosts = store.get("isolated_hosts", [])
+        existing = next((h for h in hosts if h["hostname"] == hostname), None)
+        if existing:
+            return {"action": "isolate_host", "status": "already_isolated", "hostname": hostname}
+        entry = {"hostname": hostname, "reason": reason, "isolated_at": _now(), "isolated_by": "guardian_agent", "vlan": "QUARANTINE-999"}
+        _append_store("guardian_isolation.json", "isolated_hosts", entry)
     print(f"  🏥 [ISOLATION] Isolated host: {hostname} → QUARANTINE VLAN")
     return {"action": "isolate_host", "status": "success", "hostname": hostname, "vlan_assigned": "QUARANTINE-999", "isolated_at": entry["isolated_at"]}
 
@@ -269,8 +444,6 @@ def isolate_host(hostname: str, reason: str = "Potential compromise") -> dict[st
 @tool
 def send_alert(severity: str, title: str, description: str, indicators: list[str] | None = None) -> dict[str, Any]:
     """Send a security alert to the SIEM / notification channel."""
-    store = _load_store("guardian_alerts.json")
-    alerts = store.get("alerts", [])
     alert = {
         "id": f"ALT-{int(time.time())}",
         "severity": severity.upper(),
@@ -281,9 +454,8 @@ def send_alert(severity: str, title: str, description: str, indicators: list[str
         "created_by": "guardian_agent",
         "status": "OPEN",
     }
-    alerts.append(alert)
-    store["alerts"] = alerts
-    _save_store("guardian_alerts.json", store)
+    with _store_lock("guardian_alerts.json"):
+        _append_store("guardian_alerts.json", "alerts", alert)
     print(f"  📢 [ALERT] [{severity.upper()}] {title}")
     return {"action": "send_alert", "status": "success", "alert_id": alert["id"], "severity": severity}
 
@@ -302,17 +474,32 @@ ACTION_TOOLS = {
 
 
 def execute_action(action_type: str, **kwargs: Any) -> dict[str, Any]:
+    """Blocking dispatch — call from a worker thread; async callers use the tools' ainvoke()."""
     tool_fn = ACTION_TOOLS.get(action_type)
     if not tool_fn:
         return {"action": action_type, "status": "error", "message": f"Unknown action type: {action_type}"}
+    if tool_fn.func is None:  # async-only tool (disable_user)
+        return asyncio.run(tool_fn.ainvoke(kwargs))
     return tool_fn.invoke(kwargs)
 
 
+_STATE_FILES = {
+    "firewall": "guardian_firewall.json",
+    "blocklist": "guardian_blocklist.json",
+    "directory": "guardian_directory.json",
+    "isolation": "guardian_isolation.json",
+    "alerts": "guardian_alerts.json",
+}
+
+# Store reads are blocking file I/O — overlap them instead of reading one by one
+_state_pool = ThreadPoolExecutor(max_workers=len(_STATE_FILES), thread_name_prefix="guardian-state")
+
+
+def _read_store(filename: str) -> dict[str, Any]:
+    # Locked so a read never sees a half-finished compaction
+    with _store_lock(filename):
+        return _load_store(filename)
+
+
 def get_current_state() -> dict[str, Any]:
-    return {
-        "firewall": _load_store("guardian_firewall.json"),
-        "blocklist": _load_store("guardian_blocklist.json"),
-        "directory": _load_store("guardian_directory.json"),
-        "isolation": _load_store("guardian_isolation.json"),
-        "alerts": _load_store("guardian_alerts.json"),
-    }
\ No newline at end of file
+    return dict(zip(_STATE_FILES, _state_pool.map(_read_store, _STATE_FILES.values())))
\ No newline at end of file
@@ -10,23 +10,192 @@ called directly by LangGraph nodes.
 """
 
 from __future__ import annotations
+import asyncio
+import base64
+import functools
 import os
-import json
 import hashlib
+import ipaddress
 import random
+import re
 import time
-from typing import Any
+from typing import Any, Awaitable, Callable
 
 import httpx
+import orjson
+from cachetools import TTLCache
 from langchain_core.tools import tool
 
 
+# ---------------------------------------------------------------------------
+# Shared HTTP client
+# ---------------------------------------------------------------------------
+
+_client: httpx.AsyncClient | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """
+    One pooled client for every provider, created on first use inside the running loop.
+    HTTP/2 multiplexes concurrent lookups to the same host over one kept-alive TLS connection.
+    """
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            http2=True,
+            timeout=15.0,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=20, keepalive_expiry=60),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Close pooled connections (call on app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+# ---------------------------------------------------------------------------
+# Per-provider rate limiting
+# ---------------------------------------------------------------------------
+
+class AsyncRateLimiter:
+    """Token bucket: refills at rate_per_min, allows bursts of up to `burst` calls."""
+
+    def __init__(self, rate_per_min: float, burst: int) -> None:
+        self._rate = rate_per_min / 60.0
+        self._burst = burst
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._burst, self._tokens + (now - self._last_refill) * self._rate)
+                self._last_refill = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+
+_VT_LIMITER = AsyncRateLimiter(4, burst=4)        # VT free tier: 4 req/min
+_ABUSE_LIMITER = AsyncRateLimiter(60, burst=10)
+_MAX_429_RETRIES = 3
+
+
+def _retry_after(response: httpx.Response, default: float) -> float:
+    try:
+        return max(0.0, float(response.headers.get("Retry-After", default)))
+    except ValueError:  # HTTP-date form
+        return default
+
+
+async def _request(limiter: AsyncRateLimiter, method: str, url: str, **kwargs: Any) -> httpx.Response:
+    """Rate-limited request; on 429 waits out the server's Retry-After instead of failing."""
+    for _ in range(_MAX_429_RETRIES):
+        await limiter.acquire()
+        response = await _get_client().request(method, url, **kwargs)
+        if response.status_code != 429:
+            return response
+        await asyncio.sleep(_retry_after(response, 60.0))
+    return response
+
+
+# ---------------------------------------------------------------------------
+# Lookup cache — L1 in-process TTL, optional L2 Redis (REDIS_URL)
+# ---------------------------------------------------------------------------
+
+_CACHE_VERSION = "v1"  # bump when result shape/verdict logic changes
+# Misses ("not found", "submitted for scanning", IPs nobody has reported) expire sooner
+_TTL_POS = int(os.getenv("TI_CACHE_TTL", "3600"))
+_TTL_NEG = int(os.getenv("TI_CACHE_NEGATIVE_TTL", "600"))
+_L1_POS: TTLCache = TTLCache(maxsize=10_000, ttl=_TTL_POS)
+_L1_NEG: TTLCache = TTLCache(maxsize=10_000, ttl=_TTL_NEG)
+
+_redis = None
+_redis_checked = False
+
+
+def _get_redis():
+    """redis.asyncio client if REDIS_URL is set and redis is installed, else None."""
+    global _redis, _redis_checked
+    if not _redis_checked:
+        _redis_checked = True
+        redis_url = os.getenv("REDIS_URL", "")
+        if redis_url:
+            try:
+                import redis.asyncio as aioredis
+                _redis = aioredis.from_url(redis_url)
+            except ImportError:
+                print("  ⚠️  [TI CACHE] REDIS_URL set but redis is not installed — L1 cache only")
+    return _redis
+
+
+def _is_negative(result: dict[str, Any]) -> bool:
+    if result.get("is_malicious"):
+        return False
+    return (
+        result.get("found") is False
+        or "submitted" in result.get("message", "")
+        or result.get("total_reports") == 0
+    )
+
+
+def ttl_cached(provider: str, ttl_pos: int = _TTL_POS, ttl_neg: int = _TTL_NEG):
+    """
+    Cache a lookup coroutine by (provider, indicator). Clean misses expire after
+    ttl_neg, everything else after ttl_pos; errors are never cached.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> dict[str, Any]:
+            indicator = args[0] if args else next(iter(kwargs.values()))
+            key = hashlib.sha256(f"{_CACHE_VERSION}:{provider}:{indicator}".encode()).hexdigest()
+
+            cached = _L1_POS.get(key) or _L1_NEG.get(key)
+            if cached is not None:
+                return cached
+
+            redis = _get_redis()
+            if redis is not None:
+                try:
+                    raw = await redis.get(key)
+                    if raw is not None:
+                        result = orjson.loads(raw)
+                        (_L1_NEG if _is_negative(result) else _L1_POS)[key] = result
+                        return result
+                except Exception as exc:  # noqa: BLE001
+                    print(f"  ⚠️  [TI CACHE] Redis get failed: {exc}")
+
+            result = await fn(*args, **kwargs)
+            if "error" in result:
+                return result
+
+            negative = _is_negative(result)
+            (_L1_NEG if negative else _L1_POS)[key] = result
+            if redis is not None:
+                try:
+                    await redis.set(key, orjson.dumps(result), ex=ttl_neg if negative else ttl_pos)
+                except Exception as exc:  # noqa: BLE001
+                    print(f"  ⚠️  [TI CACHE] Redis set failed: {exc}")
+            return result
+        return wrapper
+    return decorator
+
+
 # ---------------------------------------------------------------------------
 # AbuseIPDB  (real integration)
 # ---------------------------------------------------------------------------
 
 @tool
-def check_ip_abuseipdb(ip_address: str) -> dict[str, Any]:
+@ttl_cached("abuseipdb")
+async def check_ip_abuseipdb(ip_address: str) -> dict[str, Any]:
     """
     Query AbuseIPDB for the reputation of an IP address.
     Returns abuse confidence score, country, ISP, and recent reports.
@@ -49,24 +218,23 @@ def check_ip_abuseipdb(ip_address: str) -> dict[str, Any]:
     }
 
     try:
-        with httpx.Client(timeout=10.0) as client:
-            response = client.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            data = response.json().get("data", {})
-            return {
-                "source": "AbuseIPDB",
-                "indicator": ip_address,
-                "indicator_type": "ip",
-                "abuse_confidence_score": data.get("abuseConfidenceScore", 0),
-                "country_code": data.get("countryCode", "XX"),
-                "usage_type": data.get("usageType", "Unknown"),
-                "isp": data.get("isp", "Unknown"),
-                "domain": data.get("domain", ""),
-                "total_reports": data.get("totalReports", 0),
-                "last_reported_at": data.get("lastReportedAt", ""),
-                "is_whitelisted": data.get("isWhitelisted", False),
-                "is_malicious": data.get("abuseConfidenceScore", 0) > 25,
-            }
+        response = await _request(_ABUSE_LIMITER, "GET", url, headers=headers, params=params, timeout=10.0)
+        response.raise_for_status()
+        data = orjson.loads(response.content).get("data", {})
+        return {
+            "source": "AbuseIPDB",
+            "indicator": ip_address,
+            "indicator_type": "ip",
+            "abuse_confidence_score": data.get("abuseConfidenceScore", 0),
+            "country_code": data.get("countryCode", "XX"),
+            "usage_type": data.get("usageType", "Unknown"),
+            "isp": data.get("isp", "Unknown"),
+            "domain": data.get("domain", ""),
+            "total_reports": data.get("totalReports", 0),
+            "last_reported_at": data.get("lastReportedAt", ""),
+            "is_whitelisted": data.get("isWhitelisted", False),
+            "is_malicious": data.get("abuseConfidenceScore", 0) > 25,
+        }
     except Exception as exc:  # noqa: BLE001
         return {
             "source": "AbuseIPDB",
@@ -76,25 +244,28 @@ def check_ip_abuseipdb(ip_address: str) -> dict[str, Any]:
         }
 
 
+# A handful of "known bad" IPs for demo purposes
+_KNOWN_BAD_IPS: dict[str, int] = {
+    "185.220.101.47": 98,
+    "194.165.16.11": 87,
+    "45.142.212.100": 76,
+    "103.21.244.0": 65,
+}
+_COUNTRIES = ("RU", "CN", "US", "DE", "NL", "UA", "BR")
+_ISPS = (
+    "Frantech Solutions", "Mullvad VPN", "Hetzner Online GmbH",
+    "DigitalOcean LLC", "Amazon Technologies", "Unknown Hosting",
+)
+
+
 def _mock_abuseipdb_response(ip_address: str) -> dict[str, Any]:
     """Deterministic mock based on IP hash so results are reproducible in tests."""
-    seed = int(hashlib.md5(ip_address.encode()).hexdigest()[:8], 16)  # noqa: S324
+    seed = int.from_bytes(hashlib.blake2b(ip_address.encode(), digest_size=4).digest(), "big")
     rng = random.Random(seed)
 
-    # A handful of "known bad" IPs for demo purposes
-    known_bad = {
-        "185.220.101.47": 98,
-        "194.165.16.11": 87,
-        "45.142.212.100": 76,
-        "103.21.244.0": 65,
-    }
-
-    score = known_bad.get(ip_address, rng.randint(0, 30))
-    country = rng.choice(["RU", "CN", "US", "DE", "NL", "UA", "BR"])
-    isp = rng.choice([
-        "Frantech Solutions", "Mullvad VPN", "Hetzner Online GmbH",
-        "DigitalOcean LLC", "Amazon Technologies", "Unknown Hosting",
-    ])
+    score = _KNOWN_BAD_IPS.get(ip_address, rng.randint(0, 30))
+    country = rng.choice(_COUNTRIES)
+    isp = rng.choice(_ISPS)
 
     return {
         "source": "AbuseIPDB (mock)",
@@ -117,7 +288,8 @@ def _mock_abuseipdb_response(ip_address: str) -> dict[str, Any]:
 # ---------------------------------------------------------------------------
 
 @tool
-def check_hash_virustotal(file_hash: str) -> dict[str, Any]:
+@ttl_cached("vt_file")
+async def check_hash_virustotal(file_hash: str) -> dict[str, Any]:
     """
     Query VirusTotal for information about a file hash (MD5, SHA1, or SHA256).
     Uses the real VT API if VT_API_KEY is set, otherwise returns a realistic mock.
@@ -131,39 +303,38 @@ def check_hash_virustotal(file_hash: str) -> dict[str, Any]:
     headers = {"x-apikey": api_key}
 
     try:
-        with httpx.Client(timeout=15.0) as client:
-            response = client.get(url, headers=headers)
-            if response.status_code == 404:
-                return {
-                    "source": "VirusTotal",
-                    "indicator": file_hash,
-                    "indicator_type": "hash",
-                    "found": False,
-                    "is_malicious": False,
-                    "message": "Hash not found in VirusTotal database.",
-                }
-            response.raise_for_status()
-            attrs = response.json().get("data", {}).get("attributes", {})
-            stats = attrs.get("last_analysis_stats", {})
-            malicious_count = stats.get("malicious", 0)
-            total_engines = sum(stats.values())
+        response = await _request(_VT_LIMITER, "GET", url, headers=headers)
+        if response.status_code == 404:
             return {
                 "source": "VirusTotal",
                 "indicator": file_hash,
                 "indicator_type": "hash",
-                "found": True,
-                "malicious_count": malicious_count,
-                "total_engines": total_engines,
-                "detection_ratio": f"{malicious_count}/{total_engines}",
-                "meaningful_name": attrs.get("meaningful_name", ""),
-                "type_description": attrs.get("type_description", ""),
-                "tags": attrs.get("tags", []),
-                "popular_threat_name": (
-                    attrs.get("popular_threat_classification", {})
-                    .get("suggested_threat_label", "")
-                ),
-                "is_malicious": malicious_count > 5,
+                "found": False,
+                "is_malicious": False,
+                "message": "Hash not found in VirusTotal database.",
             }
+        response.raise_for_status()
+        attrs = orjson.loads(response.content).get("data", {}).get("attributes", {})
+        stats = attrs.get("last_analysis_stats", {})
+        malicious_count = stats.get("malicious", 0)
+        total_engines = sum(stats.values())
+        return {
+            "source": "VirusTotal",
+            "indicator": file_hash,
+            "indicator_type": "hash",
+            "found": True,
+            "malicious_count": malicious_count,
+            "total_engines": total_engines,
+            "detection_ratio": f"{malicious_count}/{total_engines}",
+            "meaningful_name": attrs.get("meaningful_name", ""),
+            "type_description": attrs.get("type_description", ""),
+            "tags": attrs.get("tags", []),
+            "popular_threat_name": (
+                attrs.get("popular_threat_classification", {})
+                .get("suggested_threat_label", "")
+            ),
+            "is_malicious": malicious_count > 5,
+        }
     except Exception as exc:  # noqa: BLE001
         return {
             "source": "VirusTotal",
@@ -173,13 +344,19 @@ def check_hash_virustotal(file_hash: str) -> dict[str, Any]:
         }
 
 
+@functools.lru_cache(maxsize=4096)
+def _vt_url_id(url: str) -> str:
+    """VT v3 identifies a URL by its unpadded base64url encoding."""
+    return base64.urlsafe_b64encode(url.encode()).decode().rstrip("=")
+
+
 @tool
-def check_url_virustotal(url: str) -> dict[str, Any]:
+@ttl_cached("vt_url")
+async def check_url_virustotal(url: str) -> dict[str, Any]:
     """
     Query VirusTotal for information about a URL or domain.
     Uses the real VT API if VIRUSTOTAL_API_KEY is set.
     """
-    import base64
     api_key = os.getenv("VIRUSTOTAL_API_KEY", "") or os.getenv("VT_API_KEY", "")
 
     if not api_key:
@@ -191,46 +368,44 @@ def check_url_virustotal(url: str) -> dict[str, Any]:
             "message": "No API key configured.",
         }
 
-    # VT API requires base64url encoding of the URL
-    url_id = base64.urlsafe_b64encode(url.encode()).decode().rstrip("=")
-    endpoint = f"https://www.virustotal.com/api/v3/urls/{url_id}"
+    endpoint = f"https://www.virustotal.com/api/v3/urls/{_vt_url_id(url)}"
     headers = {"x-apikey": api_key}
 
     try:
-        with httpx.Client(timeout=15.0) as client:
-            response = client.get(endpoint, headers=headers)
-            if response.status_code == 404:
-                # Submit URL for scanning first
-                scan_resp = client.post(
-                    "https://www.virustotal.com/api/v3/urls",
-                    headers=headers,
-                    data={"url": url},
-                )
-                return {
-                    "source": "VirusTotal",
-                    "indicator": url,
-                    "indicator_type": "url",
-                    "found": False,
-                    "is_malicious": False,
-                    "message": "URL submitted for scanning. Check back later.",
-                }
-            response.raise_for_status()
-            attrs = response.json().get("data", {}).get("attributes", {})
-            stats = attrs.get("last_analysis_stats", {})
-            malicious_count = stats.get("malicious", 0)
-            total_engines = sum(stats.values())
+        response = await _request(_VT_LIMITER, "GET", endpoint, headers=headers)
+        if response.status_code == 404:
+            # Submit URL for scanning first
+            await _request(
+                _VT_LIMITER, "POST",
+                "https://www.virustotal.com/api/v3/urls",
+                headers=headers,
+                data={"url": url},
+            )
             return {
                 "source": "VirusTotal",
                 "indicator": url,
                 "indicator_type": "url",
-                "found": True,
-                "malicious_count": malicious_count,
-                "total_engines": total_engines,
-                "detection_ratio": f"{malicious_count}/{total_engines}",
-                "is_malicious": malicious_count > 3,
-                "categories": attrs.get("categories", {}),
-                "last_analysis_date": attrs.get("last_analysis_date", ""),
+                "found": False,
+                "is_malicious": False,
+                "message": "URL submitted for scanning. Check back later.",
             }
+        response.raise_for_status()
+        attrs = orjson.loads(response.content).get("data", {}).get("attributes", {})
+        stats = attrs.get("last_analysis_stats", {})
+        malicious_count = stats.get("malicious", 0)
+        total_engines = sum(stats.values())
+        return {
+            "source": "VirusTotal",
+            "indicator": url,
+            "indicator_type": "url",
+            "found": True,
+            "malicious_count": malicious_count,
+            "total_engines": total_engines,
+            "detection_ratio": f"{malicious_count}/{total_engines}",
+            "is_malicious": malicious_count > 3,
+            "categories": attrs.get("categories", {}),
+            "last_analysis_date": attrs.get("last_analysis_date", ""),
+        }
     except Exception as exc:
         return {
             "source": "VirusTotal",
@@ -240,26 +415,29 @@ def check_url_virustotal(url: str) -> dict[str, Any]:
         }
 
 
+# Known-bad hashes for demo
+_KNOWN_BAD_HASHES: dict[str, tuple[str, int, int]] = {
+    "44d88612fea8a8f36de82e1278abb02f": ("Mirai.Botnet", 58, 72),
+    "e3b0c44298fc1c149afbf4c8996fb924": ("Clean file", 0, 72),
+    "3395856ce81f2b7382dee72602f798b6": ("Emotet.Dropper", 61, 72),
+    "abc123def456abc123def456abc123de": ("Cobalt.Strike.Beacon", 55, 72),
+}
+_MOCK_MALWARE_NAMES = ("", "", "Suspicious.GenericKD", "Backdoor.Generic")
 
+
+def _mock_virustotal_response(file_hash: str) -> dict[str, Any]:
     """Deterministic mock based on hash value."""
-    seed = int(hashlib.md5(file_hash.encode()).hexdigest()[:8], 16)  # noqa: S324
+    seed = int.from_bytes(hashlib.blake2b(file_hash.encode(), digest_size=4).digest(), "big")
     rng = random.Random(seed)
 
-    # Known-bad hashes for demo
-    known_bad_hashes = {
-        "44d88612fea8a8f36de82e1278abb02f": ("Mirai.Botnet", 58, 72),
-        "e3b0c44298fc1c149afbf4c8996fb924": ("Clean file", 0, 72),
-        "3395856ce81f2b7382dee72602f798b6": ("Emotet.Dropper", 61, 72),
-        "abc123def456abc123def456abc123de": ("Cobalt.Strike.Beacon", 55, 72),
-    }
-
-    if file_hash in known_bad_hashes:
-        name, mal_count, total = known_bad_hashes[file_hash]
+    known = _KNOWN_BAD_HASHES.get(file_hash)
+    if known is not None:
+        name, mal_count, total = known
         is_malicious = mal_count > 5
     else:
         mal_count = rng.choice([0, 0, 0, rng.randint(1, 65)])
         total = 72
-        name = rng.choice(["", "", "Suspicious.GenericKD", "Backdoor.Generic"])
+        name = rng.choice(_MOCK_MALWARE_NAMES)
         is_malicious = mal_count > 5
 
     return {
@@ -282,54 +460,211 @@ def check_url_virustotal(url: str) -> dict[str, Any]:
 # Convenience wrapper: run all relevant checks for a list of indicators
 # ---------------------------------------------------------------------------
 
-def bulk_investigate(indicators: list[str]) -> list[dict[str, Any]]:
+# Upper bound on in-flight lookups per provider group, however many indicators arrive
+_MAX_CONCURRENT = int(os.getenv("TI_MAX_CONCURRENT", "5"))
+
+_Lookup = Callable[[str], Awaitable[dict[str, Any]]]
+
+
+async def _run_bounded(calls: list[tuple[_Lookup, str]]) -> list[dict[str, Any]]:
+    """Run (lookup, indicator) calls on at most _MAX_CONCURRENT queue workers; results in input order."""
+    results: list[Any] = [None] * len(calls)
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in enumerate(calls):
+        queue.put_nowait(item)
+
+    async def worker() -> None:
+        while True:
+            i, (lookup, indicator) = await queue.get()
+            try:
+                results[i] = await lookup(indicator)
+            except Exception as exc:  # noqa: BLE001
+                results[i] = exc
+            finally:
+                queue.task_done()
+
+    workers = [asyncio.create_task(worker()) for _ in range(min(_MAX_CONCURRENT, len(calls)))]
+    try:
+        await queue.join()
+    finally:
+        for w in workers:
+            w.cancel()
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+    return results
+
+
+async def _check_hash(file_hash: str) -> dict[str, Any]:
+    return await check_hash_virustotal.ainvoke({"file_hash": file_hash})
+
+
+async def _check_ip(ip_address: str) -> dict[str, Any]:
+    return await check_ip_abuseipdb.ainvoke({"ip_address": ip_address})
+
+
+async def _check_url(url: str) -> dict[str, Any]:
+    result = await check_url_virustotal.ainvoke({"url": url})
+    print(f"  🔬 [VT URL] {url[:40]} → malicious={result.get('is_malicious')}")
+    return result
+
+
+async def check_hashes_virustotal_bulk(hashes: list[str]) -> list[dict[str, Any]]:
+    """
+    Look up many file hashes in one pass, results in input order.
+    VT v3 has no public multi-file lookup, so duplicates are collapsed and the
+    rest go out concurrently over the shared client under the VT rate limit.
+    """
+    unique = list(dict.fromkeys(hashes))
+    found = await _run_bounded([(_check_hash, h) for h in unique])
+    by_hash = dict(zip(unique, found))
+    for file_hash, result in by_hash.items():
+        print(f"  🔬 [VT HASH] {file_hash[:16]}... → {result.get('detection_ratio', '?')} engines")
+    return [by_hash[h] for h in hashes]
+
+
+# Per-indicator lookups by _classify() kind; hashes go through the bulk path instead
+_LOOKUPS: dict[str, _Lookup] = {"ip": _check_ip, "url": _check_url}
+
+
+def _unknown_indicator(indicator: str) -> dict[str, Any]:
+    return {
+        "source": "Guardian",
+        "indicator": indicator,
+        "indicator_type": "identifier",
+        "is_malicious": False,
+        "message": "Unknown indicator type — manual review recommended.",
+    }
+
+
+async def bulk_investigate(indicators: list[str]) -> list[dict[str, Any]]:
     """
     Given a mixed list of indicators, route each one to the appropriate tool:
     - IP addresses → AbuseIPDB
-    - File hashes (MD5/SHA1/SHA256) → VirusTotal
+    - File hashes (MD5/SHA1/SHA256) → VirusTotal (one bulk call)
     - URLs / domains → VirusTotal URL check
+    Lookups run on bounded worker pools; results come back in input order.
     """
-    results = []
-    for indicator in indicators:
+    results: list[dict[str, Any] | None] = [None] * len(indicators)
+    hash_slots: list[int] = []
+    other_slots: list[int] = []
+    other_calls: list[tuple[_Lookup, str]] = []
+    for i, indicator in enumerate(indicators):
         stripped = indicator.strip()
-        if _looks_like_hash(stripped):
-            result = check_hash_virustotal.invoke({"file_hash": stripped})
-            print(f"  🔬 [VT HASH] {stripped[:16]}... → {result.get('detection_ratio', '?')} engines")
-        elif _looks_like_ip(stripped):
-            result = check_ip_abuseipdb.invoke({"ip_address": stripped})
-        elif _looks_like_url(stripped):
-            result = check_url_virustotal.invoke({"url": stripped})
-            print(f"  🔬 [VT URL] {stripped[:40]} → malicious={result.get('is_malicious')}")
+        kind = _classify(stripped)
+        if kind == "hash":
+            hash_slots.append(i)
+        elif kind in _LOOKUPS:
+            other_slots.append(i)
+            other_calls.append((_LOOKUPS[kind], stripped))
         else:
-            result = {
-                "source": "Guardian",
-                "indicator": stripped,
-                "indicator_type": "identifier",
-                "is_malicious": False,
-                "message": "Unknown indicator type — manual review recommended.",
-            }
-        results.append(result)
-        time.sleep(0.25)  # VT free tier: 4 req/min
+            results[i] = _unknown_indicator(stripped)
 
-    return results
+    hashes = [indicators[i].strip() for i in hash_slots]
+    hash_results, other_results = await asyncio.gather(
+        check_hashes_virustotal_bulk(hashes),
+        _run_bounded(other_calls),
+    )
+    for i, result in zip(hash_slots, hash_results):
+        results[i] = result
+    for i, result in zip(other_slots, other_results):
+        results[i] = result
+    return results  # type: ignore[return-value]
+
+
+# ---------------------------------------------------------------------------
+# Cross-incident batching: concurrent incidents share one provider pass
+# ---------------------------------------------------------------------------
+
+_BATCH_WINDOW_SECONDS = 0.05
+_BATCH_MAX_SIZE = 64
 
+_batch_queue: asyncio.Queue | None = None
+_batch_worker: asyncio.Task | None = None
+_batch_tasks: set[asyncio.Task] = set()  # in-flight batches; the per-provider limiters bound them
 
-def _looks_like_hash(value: str) -> bool:
-    hex_chars = set("0123456789abcdefABCDEF")
-    return len(value) in (32, 40, 64) and all(c in hex_chars for c in value)
+
+async def _drain_batches() -> None:
+    """
+    Collect lookups for up to _BATCH_WINDOW_SECONDS, then hand the batch to its own task
+    so a slow (rate-limited) batch never holds up collecting the next window.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _batch_queue.get()]
+        deadline = loop.time() + _BATCH_WINDOW_SECONDS
+        while len(batch) < _BATCH_MAX_SIZE:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(_batch_queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        task = asyncio.create_task(_resolve_batch(batch))
+        _batch_tasks.add(task)
+        task.add_done_callback(_batch_tasks.discard)
+
+
+async def _resolve_batch(batch: list[tuple[str, asyncio.Future]]) -> None:
+    """Dedupe one batch, resolve it with a single bulk_investigate call, fan results out."""
+    waiters: dict[str, list[asyncio.Future]] = {}
+    for indicator, future in batch:
+        waiters.setdefault(indicator, []).append(future)
+    unique = list(waiters)
+    try:
+        results = await bulk_investigate(unique)
+    except Exception as exc:  # noqa: BLE001
+        for futures in waiters.values():
+            for future in futures:
+                if not future.done():
+                    future.set_exception(exc)
+        return
+
+    for indicator, result in zip(unique, results):
+        for future in waiters[indicator]:
+            if not future.done():
+                future.set_result(result)
+
+
+async def investigate_indicator(indicator: str) -> dict[str, Any]:
+    """Look up one indicator, coalesced with lookups from any other in-flight incident."""
+    global _batch_queue, _batch_worker
+    stripped = indicator.strip()
+    if _batch_worker is None or _batch_worker.done():
+        _batch_queue = asyncio.Queue()
+        _batch_worker = asyncio.create_task(_drain_batches())
+    future = asyncio.get_running_loop().create_future()
+    _batch_queue.put_nowait((stripped, future))
+    return await future
+
+
+async def investigate_batched(indicators: list[str]) -> list[dict[str, Any]]:
+    """Async counterpart of bulk_investigate() that batches across concurrent callers."""
+    return list(await asyncio.gather(*(investigate_indicator(i) for i in indicators)))
+
+
+_HASH_RE = re.compile(r"[0-9a-fA-F]{32}|[0-9a-fA-F]{40}|[0-9a-fA-F]{64}")
+_URL_RE = re.compile(r"(?:https?|ftp)://")
 
 
 def _looks_like_ip(value: str) -> bool:
-    parts = value.split(".")
-    if len(parts) != 4:
-        return False
     try:
-        return all(0 <= int(p) <= 255 for p in parts)
+        ipaddress.IPv4Address(value)
+        return True
     except ValueError:
         return False
 
 
-def _looks_like_url(value: str) -> bool:
-    return value.startswith(("http://", "https://", "ftp://")) or (
-        "." in value and "/" in value and not _looks_like_ip(value.split("/")[0])
-    )
\ No newline at end of file
+def _classify(value: str) -> str:
+    """Single pass over one indicator: "hash", "ip", "url" or "unknown"."""
+    if _HASH_RE.fullmatch(value):
+        return "hash"
+    if _looks_like_ip(value):
+        return "ip"
+    if _URL_RE.match(value) or (
+        "." in value and "/" in value and not _looks_like_ip(value.split("/", 1)[0])
+    ):
+        return "url"
+    return "unknown"
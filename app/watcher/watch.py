@@ -6,86 +6,174 @@ Usage
 -----
     python -m app.watcher.watch --dir ./logs --api http://localhost:8000
 
-The watcher uses watchdog to detect file creation events.
-It debounces rapidly-written files (waits for them to stop growing)
-before submitting to the API.
+The watcher uses watchfiles (inotify / FSEvents) to detect file changes and
+sleeps until events arrive. It debounces rapidly-written files (waits for
+them to stop growing) before submitting to the API; ready files are
+submitted concurrently.
 """
 
 from __future__ import annotations
 import argparse
+import asyncio
 import os
-import time
 import hashlib
+import random
+from collections import OrderedDict
 from pathlib import Path
 
 import httpx
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler, FileCreatedEvent, FileModifiedEvent
+import orjson
+from watchfiles import Change, awatch
 
 
 WATCH_EXTENSIONS = {".log", ".txt", ".json", ".syslog"}
 DEBOUNCE_SECONDS = float(os.getenv("WATCHER_DEBOUNCE", "2.0"))
 API_BASE = os.getenv("GUARDIAN_API_URL", "http://localhost:8000")
+MAX_SUBMIT_BYTES = int(os.getenv("WATCHER_MAX_SUBMIT_BYTES", str(16 * 1024 * 1024)))
+DEDUPE_CAPACITY = int(os.getenv("WATCHER_DEDUPE_CAPACITY", "100000"))
+SUBMIT_ATTEMPTS = 5
+RETRY_MAX_SECONDS = 30.0
+
+
+def _hash_file(path: str) -> bytes:
+    """16-byte content digest for deduplication, streamed from disk in 1 MiB chunks."""
+    with open(path, "rb") as fp:
+        return hashlib.file_digest(fp, lambda: hashlib.blake2b(digest_size=16), _bufsize=2**20).digest()
+
+
+def _read_capped(path: str) -> tuple[str, bool]:
+    """
+    Read at most MAX_SUBMIT_BYTES of a log, keeping the tail (the newest lines)
+    when the file is larger. Returns (stripped text, truncated?).
+    """
+    with open(path, "rb") as fp:
+        size = os.fstat(fp.fileno()).st_size
+        truncated = size > MAX_SUBMIT_BYTES
+        if truncated:
+            fp.seek(-MAX_SUBMIT_BYTES, os.SEEK_END)
+        data = fp.read(MAX_SUBMIT_BYTES)
+    if truncated:
+        # Drop the partial first line the seek landed in
+        data = data.partition(b"\n")[2] or data
+    return data.decode("utf-8", errors="replace").strip(), truncated
+
+
+def _backoff(attempt: int, response: httpx.Response | None) -> float:
+    """Server's Retry-After if it sent one, else full-jitter exponential backoff."""
+    if response is not None and "Retry-After" in response.headers:
+        try:
+            return min(RETRY_MAX_SECONDS, max(0.0, float(response.headers["Retry-After"])))
+        except ValueError:  # HTTP-date form
+            pass
+    return random.uniform(0, min(RETRY_MAX_SECONDS, 2.0 ** attempt))
 
 
-class LogFileHandler(FileSystemEventHandler):
-    def __init__(self, api_base: str):
+class LogFileHandler:
+    def __init__(self, api_base: str, client: httpx.AsyncClient):
         self.api_base = api_base.rstrip("/")
-        self._pending: dict[str, float] = {}   # path → last-modified time
-        self._submitted: set[str] = set()       # hashes of already-submitted content
-
-    def on_created(self, event: FileCreatedEvent):
-        if not event.is_directory:
-            self._mark_pending(event.src_path)
-
-    def on_modified(self, event: FileModifiedEvent):
-        if not event.is_directory:
-            self._mark_pending(event.src_path)
-
-    def _mark_pending(self, path: str):
-        if Path(path).suffix.lower() in WATCH_EXTENSIONS:
-            self._pending[path] = time.time()
-
-    def flush_pending(self):
-        """Call periodically to submit files that have stopped changing."""
-        now = time.time()
-        ready = [p for p, t in list(self._pending.items()) if now - t >= DEBOUNCE_SECONDS]
-        for path in ready:
-            del self._pending[path]
-            self._submit_file(path)
-
-    def _submit_file(self, path: str):
+        self._client = client
+        self._pending: dict[str, asyncio.TimerHandle] = {}  # path → debounce timer
+        self._tasks: set[asyncio.Task] = set()
+        # 16-byte digests of already-submitted content, oldest first, capped at DEDUPE_CAPACITY
+        self._submitted: OrderedDict[bytes, None] = OrderedDict()
+
+    def on_change(self, path: str):
+        """(Re)start the file's debounce timer; it fires once the file stops changing."""
+        timer = self._pending.pop(path, None)
+        if timer is not None:
+            timer.cancel()
+        loop = asyncio.get_running_loop()
+        self._pending[path] = loop.call_later(DEBOUNCE_SECONDS, self._ready, path)
+
+    def _ready(self, path: str):
+        del self._pending[path]
+        task = asyncio.create_task(self._submit_file(path))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _submit_file(self, path: str):
         try:
-            content = Path(path).read_text(encoding="utf-8", errors="replace").strip()
-            if not content:
-                return
-
-            # Deduplicate by content hash
-            content_hash = hashlib.md5(content.encode()).hexdigest()  # noqa: S324
+            # Hashing and reading block on disk — keep them off the event loop
+            content_hash = await asyncio.to_thread(_hash_file, path)
             if content_hash in self._submitted:
+                self._submitted.move_to_end(content_hash)
                 print(f"  ⏭️  Skipping duplicate: {path}")
                 return
-            self._submitted.add(content_hash)
+            # Claim the digest before the next await so a concurrent copy is skipped
+            self._remember(content_hash)
+
+            content, truncated = await asyncio.to_thread(_read_capped, path)
+            if not content:
+                self._submitted.pop(content_hash, None)
+                return
 
             print(f"\n📂 [WATCHER] New log detected: {path}")
-            print(f"   Size: {len(content)} chars  |  Submitting to {self.api_base}")
+            print(f"   Size: {len(content)} chars{' (tail only)' if truncated else ''}  |  Submitting to {self.api_base}")
 
-            resp = httpx.post(
-                f"{self.api_base}/api/incidents",
-                json={"raw_log": content, "log_source": f"file_watcher:{Path(path).name}"},
-                timeout=10.0,
+            resp = await self._post_incident(
+                orjson.dumps({"raw_log": content, "log_source": f"file_watcher:{Path(path).name}"}),
+                content_hash.hex(),
             )
-            resp.raise_for_status()
-            data = resp.json()
+            data = orjson.loads(resp.content)
             print(f"   ✅ Submitted — Incident ID: {data.get('incident_id', '?')}")
             print(f"   📡 Monitor at: {self.api_base}/api/incidents/{data.get('incident_id')}")
 
+        except FileNotFoundError:
+            pass  # removed before the debounce expired
         except httpx.ConnectError:
             print(f"  ❌ Cannot connect to Guardian API at {self.api_base}")
             print(f"     Make sure the API is running: uvicorn app.api.server:app --reload")
         except Exception as exc:
             print(f"  ❌ Error submitting {path}: {exc}")
 
+    async def _post_incident(self, body: bytes, idempotency_key: str) -> httpx.Response:
+        """
+        POST with retries on connection errors, 429 and 5xx. The content digest is the
+        Idempotency-Key, so a replayed submission maps to the incident already created.
+        """
+        headers = {"Content-Type": "application/json", "Idempotency-Key": idempotency_key}
+        for attempt in range(SUBMIT_ATTEMPTS):
+            resp = None
+            try:
+                resp = await self._client.post(f"{self.api_base}/api/incidents", content=body, headers=headers)
+                if resp.status_code != 429 and resp.status_code < 500:
+                    resp.raise_for_status()
+                    return resp
+            except httpx.ConnectError:
+                if attempt == SUBMIT_ATTEMPTS - 1:
+                    raise
+            if attempt < SUBMIT_ATTEMPTS - 1:
+                await asyncio.sleep(_backoff(attempt, resp))
+        resp.raise_for_status()
+        return resp
+
+    def _remember(self, content_hash: bytes):
+        self._submitted[content_hash] = None
+        if len(self._submitted) > DEDUPE_CAPACITY:
+            self._submitted.popitem(last=False)
+
+    async def drain(self):
+        for timer in self._pending.values():
+            timer.cancel()
+        self._pending.clear()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+def _is_watched(change: Change, path: str) -> bool:
+    return change != Change.deleted and Path(path).suffix.lower() in WATCH_EXTENSIONS
+
+
+async def watch_async(watch_path: Path, api_base: str):
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        handler = LogFileHandler(api_base=api_base, client=client)
+        try:
+            async for changes in awatch(watch_path, watch_filter=_is_watched, recursive=False):
+                for _, path in changes:
+                    handler.on_change(path)
+        finally:
+            await handler.drain()
+
 
 def watch(watch_dir: str, api_base: str):
     watch_path = Path(watch_dir).resolve()
@@ -103,20 +191,10 @@ def watch(watch_dir: str, api_base: str):
    Press Ctrl+C to stop.
 """)
 
-    handler = LogFileHandler(api_base=api_base)
-    observer = Observer()
-    observer.schedule(handler, str(watch_path), recursive=False)
-    observer.start()
-
     try:
-        while True:
-            handler.flush_pending()
-            time.sleep(0.5)
+        asyncio.run(watch_async(watch_path, api_base))
     except KeyboardInterrupt:
         print("\n👋 Watcher stopped.")
-    finally:
-        observer.stop()
-        observer.join()
 
 
 def main():
@@ -0,0 +1,90 @@
+"""
+Regression test: identity fields survive a full graph run.
+
+Nodes return partial updates only, so incident_id / log_source / started_at /
+raw_log must come through every path (noise, auto-execute, approval) untouched.
+The LLM, threat intel and side-effecting tools are stubbed.
+
+Run:  python -m pytest -q tests
+"""
+
+from __future__ import annotations
+import asyncio
+
+import pytest
+from langgraph.checkpoint.memory import MemorySaver
+
+from app.agent import graph
+from app.agent.schemas import AnalyzerOutput, InvestigatorOutput, MitigationAction, MitigatorOutput
+
+
+class _StubStructured:
+    def __init__(self, result):
+        self._result = result
+
+    async def ainvoke(self, messages):
+        return self._result
+
+
+class _StubLLM:
+    def __init__(self, risk_score: int):
+        self._outputs = {
+            AnalyzerOutput: AnalyzerOutput(risk_score=risk_score, found_indicators=["185.220.101.47"],
+                                           threat_summary="stub"),
+            InvestigatorOutput: InvestigatorOutput(updated_risk_score=risk_score, threat_context="stub"),
+            MitigatorOutput: MitigatorOutput(mitigation_plan="stub plan", actions=[
+                MitigationAction(action_type="block_ip", target="185.220.101.47", justification="stub"),
+            ]),
+        }
+
+    def with_structured_output(self, schema):
+        return _StubStructured(self._outputs[schema])
+
+
+class _StubTool:
+    def invoke(self, kwargs):
+        return {"status": "success"}
+
+
+@pytest.mark.parametrize("risk_score", [2, 6, 9], ids=["noise", "auto_execute", "approval"])
+def test_identity_fields_survive_full_run(monkeypatch, risk_score):
+    async def no_ti(indicators):
+        return [{"indicator": i, "is_malicious": True} for i in indicators]
+
+    monkeypatch.setattr(graph, "_build_llm", lambda: _StubLLM(risk_score))
+    monkeypatch.setattr(graph, "_llm_config", lambda: ("stub", "stub-model"))
+    monkeypatch.setattr(graph.llm_cache, "get", lambda key: None)
+    monkeypatch.setattr(graph.llm_cache, "put", lambda key, value: None)
+    monkeypatch.setattr(graph, "_persist", lambda state, update: None)
+    monkeypatch.setattr(graph, "investigate_batched", no_ti)
+    monkeypatch.setattr(graph, "execute_action", lambda *a, **kw: {"status": "success"})
+    monkeypatch.setattr(graph, "send_alert", _StubTool())
+    monkeypatch.setenv("GUARDIAN_AUTO_APPROVE", "true")
+
+    identity = {
+        "incident_id": "3f2b8c1e-0000-4000-8000-000000000001",
+        "log_source": "pytest:auth.log",
+        "started_at": "2025-01-01T00:00:00+00:00",
+        "raw_log": "Failed password for root from 185.220.101.47 port 22 ssh2",
+    }
+    initial_state = {
+        "messages": [], "risk_score": 0, "found_indicators": [],
+        "requires_approval": False, "mitigation_plan": "", "actions": [],
+        "executed_actions": [], "investigation_results": [],
+        "current_node": "start", "status": "analyzing",
+        "approval_token": "", "approval_decision": "pending",
+        "completed_at": "", "stream_events": [],
+        **identity,
+    }
+
+    compiled = graph.build_graph(checkpointer=MemorySaver())
+    config = {"configurable": {"thread_id": identity["incident_id"]}}
+    final = asyncio.run(compiled.ainvoke(initial_state, config=config))
+
+    for field, value in identity.items():
+        assert final[field] == value, field
+    assert final["status"] == "complete"
+    assert final["current_node"] == "report"
+    assert all(e["incident_id"] == identity["incident_id"] for e in final["stream_events"])
+    if risk_score > 3:
+        assert final["executed_actions"] == ["block_ip:185.220.101.47 → success"]